@@ -0,0 +1,6 @@
+import currentData from "../output-sorted.columnar.json" with { type: "json" };
+import Data, { ColumnarDump } from "./data.js";
+
+export default async function loadCurrentData(locale) {
+    return new Data(ColumnarDump.decode(currentData), locale);
+}
@@ -0,0 +1,6 @@
+import Data, { ShardedDump } from "./data.js";
+
+export default async function loadCurrentData(locale) {
+    const dump = new ShardedDump(new URL("output-sorted/", document.baseURI).href);
+    return Data.fromShards(dump, locale);
+}
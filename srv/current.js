@@ -0,0 +1,6 @@
+import currentData from "../output-sorted.json" with { type: "json" };
+import Data from "./data.js";
+
+export default async function loadCurrentData(locale) {
+    return new Data(currentData, locale);
+}
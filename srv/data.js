@@ -1,12 +1,20 @@
 export const EXPECTED_POSITIONS = 2000;
+const SHARD_FIELDS = [
+    "version", "count", "chunk_size", "chunks", "history", "artists", "extra"
+];
+const COLUMNAR_VERSION = 1;
+const COLUMNAR_FIELDS = ["version", "count", "artist_names", "history"];
+const ENCODED_FIELDS = new Set(["artist"]);
+const NOT_CHARTED = 0;
 
 export default class Data {
-    constructor(data, locale) {
+    constructor(data, locale, dump = null) {
         Object.assign(this, data);
+        this.count ??= this.tracks.length;
+        this.dump = dump;
+        this.loading = new Map();
         this.direction = this.reverse ? 1 : -1;
-        this.front = this.positions.at(-1);
-        this.end = this.positions[0];
-        this.start = this.reverse ? this.end : this.front;
+        this.updateBounds();
 
         this.trackColumns = ["position", "artist", "title"];
         this.artistColumns = ["position", "title", "year"];
@@ -52,8 +60,66 @@ export default class Data {
         };
     }
 
+    static async fromShards(dump, locale) {
+        return new Data(await dump.loadStart(), locale, dump);
+    }
+
+    updateBounds() {
+        this.front = this.positions.at(-1);
+        this.end = this.positions[0];
+        this.start = this.reverse ? this.end : this.front;
+    }
+
+    loadOnce(name, loader) {
+        if (this.dump === null) {
+            return Promise.resolve(this);
+        }
+        if (!this.loading.has(name)) {
+            this.loading.set(name, loader().then(() => this));
+        }
+        return this.loading.get(name);
+    }
+
+    loadTracks() {
+        return this.loadOnce("tracks", async () => {
+            const chunks = await this.dump.loadChunks(1);
+            for (const chunk of chunks) {
+                this.tracks.push(...ShardedDump.copyTracks(chunk));
+                this.positions.push(...chunk.positions);
+                this.keys.push(...chunk.keys);
+            }
+            this.updateBounds();
+        });
+    }
+
+    loadHistory() {
+        return this.loadOnce("history", async () => {
+            const [histories] = await Promise.all([
+                this.dump.loadHistories(),
+                this.loadTracks()
+            ]);
+            ShardedDump.addHistories(this.tracks, histories);
+        });
+    }
+
+    loadArtists() {
+        return this.loadOnce("artists", async () => {
+            const [artists, extra] = await Promise.all([
+                this.dump.loadArtists(),
+                this.dump.loadExtras()
+            ]);
+            this.artists = artists;
+            Object.assign(this, extra);
+        });
+    }
+
+    loadAll() {
+        return Promise.all([this.loadHistory(), this.loadArtists()])
+            .then(() => this);
+    }
+
     findTrack(pos, field = "tracks") {
-        return this[field][this.reverse ? this.tracks.length - pos : pos - 1];
+        return this[field][this.reverse ? this.count - pos : pos - 1];
     }
 
     formatRankChange(d, position) {
@@ -91,3 +157,192 @@ export default class Data {
         return `${this.wiki_url}${encodeURIComponent(page.replaceAll(" ", "_"))}`;
     }
 }
+
+export class ShardedDump {
+    constructor(url, fetcher = globalThis.fetch) {
+        this.url = url.endsWith("/") ? url : `${url}/`;
+        this.fetcher = fetcher;
+        this.shards = new Map();
+    }
+
+    loadShard(name) {
+        if (!this.shards.has(name)) {
+            this.shards.set(name, this.fetcher(new URL(name, this.url))
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`Could not load ${name}: ${response.status}`);
+                    }
+                    return response.json();
+                })
+            );
+        }
+        return this.shards.get(name);
+    }
+
+    loadManifest() {
+        return this.loadShard("manifest.json");
+    }
+
+    async loadChunk(index) {
+        const manifest = await this.loadManifest();
+        return this.loadShard(manifest.chunks[index]);
+    }
+
+    async loadHistory(year) {
+        const manifest = await this.loadManifest();
+        if (!(year in manifest.history)) {
+            return null;
+        }
+        return this.loadShard(manifest.history[year]);
+    }
+
+    async loadArtists() {
+        const manifest = await this.loadManifest();
+        return this.loadShard(manifest.artists);
+    }
+
+    async loadExtra(key) {
+        const manifest = await this.loadManifest();
+        return key in manifest.extra ? this.loadShard(manifest.extra[key]) :
+            undefined;
+    }
+
+    async loadChunks(start = 0, end = null) {
+        const manifest = await this.loadManifest();
+        const stop = end === null ? manifest.chunks.length :
+            Math.min(end, manifest.chunks.length);
+        return Promise.all(Array.from({ length: Math.max(stop - start, 0) },
+            (_, index) => this.loadChunk(start + index)
+        ));
+    }
+
+    async loadHistories(years = null) {
+        const manifest = await this.loadManifest();
+        const historyYears = years === null ?
+            Object.keys(manifest.history) : years.map(String);
+        const histories = await Promise.all(
+            historyYears.map(year => this.loadHistory(year))
+        );
+        return Object.fromEntries(
+            historyYears.map((year, index) => [year, histories[index]])
+        );
+    }
+
+    async loadExtras() {
+        const manifest = await this.loadManifest();
+        const extraKeys = Object.keys(manifest.extra);
+        const extra = await Promise.all(
+            extraKeys.map(key => this.loadExtra(key))
+        );
+        return Object.fromEntries(
+            extraKeys.map((key, index) => [key, extra[index]])
+        );
+    }
+
+    static copyTracks(chunk) {
+        // Copy tracks so that positions of history years do not alter shards
+        return chunk.tracks.map(track => ({ ...track }));
+    }
+
+    static addHistories(tracks, histories) {
+        for (const [year, history] of Object.entries(histories)) {
+            if (history === null) {
+                continue;
+            }
+            for (const [i, track] of tracks.entries()) {
+                if (history.positions[i] !== null) {
+                    track[year] = history.positions[i];
+                }
+            }
+        }
+    }
+
+    static assemble(manifest, trackChunks) {
+        const data = { ...manifest };
+        for (const key of SHARD_FIELDS) {
+            delete data[key];
+        }
+        data.tracks = trackChunks.flatMap(chunk => ShardedDump.copyTracks(chunk));
+        data.positions = trackChunks.flatMap(chunk => chunk.positions);
+        data.keys = trackChunks.flatMap(chunk => chunk.keys);
+        return data;
+    }
+
+    async loadStart() {
+        const manifest = await this.loadManifest();
+        const data = ShardedDump.assemble(manifest, await this.loadChunks(0, 1));
+        data.count = manifest.count;
+        data.artists = {};
+        return data;
+    }
+
+    async load({ chunks = null, years = null } = {}) {
+        const [manifest, trackChunks, histories, artists, extra] =
+            await Promise.all([
+                this.loadManifest(),
+                this.loadChunks(0, chunks),
+                this.loadHistories(years),
+                this.loadArtists(),
+                this.loadExtras()
+            ]);
+
+        const data = ShardedDump.assemble(manifest, trackChunks);
+        data.artists = artists;
+        ShardedDump.addHistories(data.tracks, histories);
+        Object.assign(data, extra);
+        return data;
+    }
+}
+
+export class ColumnarDump {
+    static isColumnar(data) {
+        return "artist_names" in data && !Array.isArray(data.tracks);
+    }
+
+    static decodeColumns(columns, names, count) {
+        const tracks = Array.from({ length: count }, () => ({}));
+        for (const [field, column] of Object.entries(columns.fields ?? {})) {
+            const encoded = ENCODED_FIELDS.has(field);
+            for (const [i, value] of column.entries()) {
+                if (value !== null) {
+                    tracks[i][field] = encoded && Number.isInteger(value) ?
+                        names[value] : value;
+                }
+            }
+        }
+        for (const [field, subtrackColumns] of Object.entries(columns.subtracks ?? {})) {
+            const subtracks = ColumnarDump.decodeColumns(subtrackColumns,
+                names, count
+            );
+            for (const [i, subtrack] of subtracks.entries()) {
+                if (subtrack !== null) {
+                    tracks[i][field] = subtrack;
+                }
+            }
+        }
+        const absent = new Set(columns.absent ?? []);
+        return tracks.map((track, i) => absent.has(i) ? null : track);
+    }
+
+    static decode(data) {
+        if (data.version !== COLUMNAR_VERSION) {
+            throw new Error(`Unsupported columnar dump version: ${data.version}`);
+        }
+        const tracks = ColumnarDump.decodeColumns(data.tracks,
+            data.artist_names, data.count
+        ).map(track => track ?? {});
+        for (const [j, year] of data.history.years.entries()) {
+            for (const [i, position] of data.history.positions[j].entries()) {
+                if (position !== NOT_CHARTED) {
+                    tracks[i][year] = position;
+                }
+            }
+        }
+
+        const dump = { ...data, tracks };
+        for (const key of COLUMNAR_FIELDS) {
+            delete dump[key];
+        }
+        return dump;
+    }
+}
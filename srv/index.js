@@ -1,6 +1,6 @@
 import "./style.scss";
 import * as d3 from "d3";
-import currentData from "../output-sorted.json" with { type: "json" };
+import loadCurrentData from "@current";
 
 import Data from "./data.js";
 import Format from "./format.js";
@@ -26,7 +26,7 @@ theme.addEventListener('change', event => {
     document.location.hash = "#/theme";
 });
 
-const defaultData = new Data(currentData, locale);
+const defaultData = await loadCurrentData(locale);
 const yearData = {};
 try {
     const rawData = globalThis.localStorage.getItem("data");
@@ -40,7 +40,9 @@ catch (error) {
     console.error(error);
 }
 
+let loads = 0;
 const load = (data = defaultData) => {
+    const loaded = ++loads;
     d3.select("#container").remove();
     d3.select("body")
         .append("div")
@@ -74,6 +76,24 @@ const load = (data = defaultData) => {
 
     search.createModal();
 
+    // Sharded data only has its first tracks until the others are loaded,
+    // after which the table also needs the history and artist charts
+    if (data.dump !== null) {
+        data.loadTracks().then(() => {
+            if (loaded === loads) {
+                scroll.updateRange();
+                scroll.updatePagination();
+                table.update();
+                tabs.updateActive();
+            }
+            return data.loadAll();
+        }).then(() => {
+            if (loaded === loads) {
+                table.update();
+            }
+        }).catch(error => console.error(error));
+    }
+
     return tabs;
 };
 
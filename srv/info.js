@@ -534,10 +534,13 @@ export const toggleInfoCell = (context, node, d = null, toggle = true, other = n
         .append("div")
         .classed("columns is-multiline is-centered is-vcentered", true);
 
-    const info = new Info(context, pos, cell, d);
-    if (other) {
-        info.addPositions(other);
-    }
-    info.makeProgressionChart();
-    info.makeArtistCharts();
+    // The charts need the history and artist charts of sharded data
+    context.search.load().then(() => {
+        const info = new Info(context, pos, cell, d);
+        if (other) {
+            info.addPositions(other);
+        }
+        info.makeProgressionChart();
+        info.makeArtistCharts();
+    });
 };
@@ -7,6 +7,7 @@ const searchColumns = ["position", "artist", "title"];
 
 export default class SearchModal extends Modal {
     MODAL_ID = "search";
+    loading = null;
 
     constructor(locale, data, state, scroll) {
         super();
@@ -32,7 +33,6 @@ export default class SearchModal extends Modal {
                     this.data.findTrack(this.data.artists[i][0])[fieldName];
             }
         });
-        this.fill();
         this.artistFields = {
             position: d => `${this.data.artists[d][0]}.`,
             artist: d => this.data.findTrack(this.data.artists[d][0]).artist,
@@ -40,6 +40,12 @@ export default class SearchModal extends Modal {
         };
     }
 
+    load() {
+        // Tracks and artist charts of sharded data are indexed once loaded
+        this.loading ??= this.data.loadAll().then(() => this.fill());
+        return this.loading;
+    }
+
     fill() {
         for (const [key, value] of Object.entries(this.data)) {
             if (key === "positions") {
@@ -108,6 +114,7 @@ export default class SearchModal extends Modal {
 
     open(closeCallback = null) {
         super.open(closeCallback);
+        this.load();
         const input = d3.select("#search input").node();
         input.focus();
         input.select();
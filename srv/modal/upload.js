@@ -1,7 +1,29 @@
 import * as d3 from "d3";
-import Data from "../data.js";
+import Data, { ColumnarDump, ShardedDump } from "../data.js";
 import Modal from "./index.js";
 
+const readDump = (files) => {
+    const shards = new Map(Array.from(files, file => [file.name, file]));
+    if (!shards.has("manifest.json")) {
+        return files[0].text().then(rawData => {
+            const data = JSON.parse(rawData);
+            return ColumnarDump.isColumnar(data) ?
+                ColumnarDump.decode(data) : data;
+        });
+    }
+    // Files of a sharded dump are loaded by their names
+    const dump = new ShardedDump(new URL("upload/", document.baseURI).href,
+        url => {
+            const name = url.pathname.split("/").at(-1);
+            return Promise.resolve(shards.has(name) ?
+                new Response(shards.get(name)) :
+                new Response(null, { status: 404 })
+            );
+        }
+    );
+    return dump.load();
+};
+
 export default class UploadModal extends Modal {
     MODAL_ID = "upload";
 
@@ -24,7 +46,8 @@ export default class UploadModal extends Modal {
         label.append("input")
             .classed("file-input", true)
             .attr("type", "file")
-            .attr("accept", ".json,application/json");
+            .attr("accept", ".json,application/json")
+            .attr("multiple", true);
         const text = label.append("span")
             .classed("file-cta", true);
         text.append("span")
@@ -32,7 +55,7 @@ export default class UploadModal extends Modal {
             .text(String.fromCodePoint(0x1f4e4));
         text.append("span")
             .classed("file-label", true)
-            .text("[ Upload / drag-&-drop dump ]");
+            .text("[ Upload / drag-&-drop dump or shards ]");
         box.append("table")
             .classed("table is-fullwidth is-narrow is-hoverable is-striped",
                 true
@@ -73,28 +96,22 @@ export default class UploadModal extends Modal {
             });
         updateRows();
 
-        const uploadFile = (dump) => {
-            if (!dump) {
+        const uploadFiles = (files) => {
+            if (!files?.length) {
                 file.classed("is-error", true);
                 return;
             }
-            dump.text().then((rawData) => {
-                try {
-                    const data = JSON.parse(rawData);
-                    this.yearData[data.year] = data;
-                    globalThis.localStorage.setItem("data", JSON.stringify(this.yearData));
-                    updateRows();
-                    file.classed("is-error", false);
-                    this.load(new Data(data, this.locale)).enable(this.load, this.yearData);
-                }
-                catch {
-                    file.classed("is-error", true);
-                }
+            readDump(files).then((data) => {
+                this.yearData[data.year] = data;
+                globalThis.localStorage.setItem("data", JSON.stringify(this.yearData));
+                updateRows();
+                file.classed("is-error", false);
+                this.load(new Data(data, this.locale)).enable(this.load, this.yearData);
             }).catch(() => {
                 file.classed("is-error", true);
             });
         };
-        input.on("change", (event) => uploadFile(event.target.files[0]));
+        input.on("change", (event) => uploadFiles(event.target.files));
         file.on("dragenter", (event) => {
             // Adjust the display to show we are a proper drop zone
             event.stopPropagation();
@@ -108,7 +125,7 @@ export default class UploadModal extends Modal {
             .on("drop", (event) => {
                 event.stopPropagation();
                 event.preventDefault();
-                uploadFile(event.dataTransfer.files[0]);
+                uploadFiles(event.dataTransfer.files);
             });
     }
 }
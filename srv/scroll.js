@@ -45,14 +45,13 @@ export default class Scroll {
             .attr("id", "pagination-input")
             .classed("pagination-next", true)
             .attr("type", "number")
-            .attr("min", Math.min(this.data.end, this.data.front))
-            .attr("max", Math.max(this.data.end, this.data.front))
             .on("change", (event) => {
                 if (event.target.validity.valid) {
                     this.scrollPage(Number(event.target.value));
                     event.target.blur();
                 }
             });
+        this.updateRange();
 
         d3.select(document).on("visibilitychange", () => {
             if (!document.hidden && this.currentTimer !== null) {
@@ -75,6 +74,20 @@ export default class Scroll {
         });
     }
 
+    updateRange() {
+        this.input.attr("min", Math.min(this.data.end, this.data.front))
+            .attr("max", Math.max(this.data.end, this.data.front));
+    }
+
+    stopTimers() {
+        this.currentTimer?.stop();
+        this.currentTimer = null;
+        this.currentTimerParams = null;
+        this.startTimer?.stop();
+        this.startTimer = null;
+        this.startPos = null;
+    }
+
     scrollPage(d) {
         const posNode = this.scrollPositionRow(d);
         if (posNode) {
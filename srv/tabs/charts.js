@@ -506,12 +506,20 @@ export default class Charts {
             buttonIcon.text(active ? "\u25b8" : "\u25be");
             dropdown.classed("is-active", !active);
         });
+        this.dropdown = dropdown;
+        this.buttonIcon = buttonIcon;
         dropdown.append("div")
             .classed("dropdown-menu", true)
             .attr("id", "chart-dropdown")
             .attr("role", "menu")
             .append("div")
-            .classed("dropdown-content", true)
+            .classed("dropdown-content", true);
+    }
+
+    createItems() {
+        const dropdown = this.dropdown;
+        const buttonIcon = this.buttonIcon;
+        dropdown.select(".dropdown-content")
             .selectAll("a, hr")
             .data(d3.filter(this.sources,
                 chart => chart.enabled ? chart.enabled() : true
@@ -534,7 +542,10 @@ export default class Charts {
             );
     }
 
-    select(id) {
+    async select(id) {
+        // The charts need the history and artist charts of sharded data
+        await this.data.loadAll();
+        this.createItems();
         const columns = d3.select("#container")
             .select("#charts .columns");
         columns.select("#chart-dropdown")
@@ -233,8 +233,8 @@ export default class Tabs {
                 else if (hash.startsWith(hashPrefix)) {
                     chart = hash.slice(hashPrefix.length);
                 }
-                const content = this.charts.select(chart || this.charts.sources[0].id);
-                this.fixContentScroll(content);
+                this.charts.select(chart || this.charts.sources[0].id)
+                    .then(content => this.fixContentScroll(content));
             }
         });
         this.tabs.set("info", {
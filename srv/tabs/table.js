@@ -43,7 +43,13 @@ export default class Table {
                     cell.text(this.data.fields[d].column);
                 }
             });
-        const rows = table.append("tbody").selectAll("tr")
+        this.body = table.append("tbody");
+        this.update();
+    }
+
+    update() {
+        this.scroll.stopTimers();
+        const rows = this.body.selectAll("tr:not(.info)")
             .data(this.data.tracks)
             .join("tr")
             .classed("is-clickable", true)
@@ -67,10 +73,14 @@ export default class Table {
         rows.selectAll("td")
             .data((_, i) => new Array(this.data.trackColumns.length + 1).fill(i))
             .join("td")
-            .text((pos, i) => i === this.data.trackColumns.length ? "\u25b6" :
-                this.data.fields[this.data.trackColumns[i]].field(this.data.tracks[pos],
+            .text((pos, i) => {
+                if (i === this.data.trackColumns.length) {
+                    return d3.select(rows.nodes()[pos]).classed("is-info") ?
+                        "\u25bc" : "\u25b6";
+                }
+                return this.data.fields[this.data.trackColumns[i]].field(this.data.tracks[pos],
                     this.data.positions[pos], this.data.keys[pos]
-                )
-            );
+                );
+            });
     }
 }
@@ -2,15 +2,82 @@
 Parse lists of song tracks in the NPO Radio 2 Top 2000 from various years.
 """
 
+import gc
+import json
 import logging
 import sys
+import time
+import tomllib
 from collections import deque
+from collections.abc import Collection, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from itertools import zip_longest
+from multiprocessing import get_all_start_methods, get_context
+from pathlib import Path
+
+from typing_extensions import TypedDict
 
 from .logging import LOGGER
-from .output.base import Format
+from .normalization import Normalizer
+from .output.base import ChartCache, Format
+from .output.manifest import COMPRESSORS, Changes
+from .profiling import PROFILER, Timing
 from .readers.base import Base as ReaderBase
 from .readers.multi import OldFiles, Years
+from .watch import Watcher
+
+SETTINGS_FILES = (Path("fields.toml"), Path("fixes.toml"), Path("output.toml"))
+
+
+class Options(TypedDict, total=False):
+    """
+    Command line options.
+    """
+
+    jobs: int
+    snapshots: bool
+    profile: str
+    live: float
+    watch: float
+    compress: tuple[str, ...]
+
+
+def _parse_compression(value: str) -> tuple[str, ...]:
+    if value == "":
+        return tuple(COMPRESSORS)
+    suffixes = tuple(value.split(","))
+    for suffix in suffixes:
+        if suffix not in COMPRESSORS:
+            raise ValueError(f"Unavailable compression: {suffix}")
+    return suffixes
+
+
+def _parse_options(argv: list[str]) -> tuple[list[str], Options]:
+    arguments: list[str] = []
+    options: Options = {}
+    for argument in argv:
+        if not argument.startswith("--"):
+            arguments.append(argument)
+            continue
+
+        name, _, value = argument[2:].partition("=")
+        match name:
+            case "jobs":
+                options["jobs"] = int(value)
+            case "snapshots":
+                options["snapshots"] = True
+            case "profile":
+                options["profile"] = value
+            case "live":
+                options["live"] = float(value) if value != "" else 60.0
+            case "watch":
+                options["watch"] = float(value) if value != "" else 1.0
+            case "compress":
+                options["compress"] = _parse_compression(value)
+            case _:
+                raise ValueError(f"Unknown option: {argument}")
+
+    return arguments, options
 
 
 def _parse_first_args(
@@ -116,6 +183,21 @@ def _select_year(
     return current_year
 
 
+def _select_reader_year(
+    reader: ReaderBase,
+    current_year: float,
+    latest_year: float | None,
+    year: float | None,
+) -> tuple[float, float, bool]:
+    if latest_year is None:
+        return reader.latest_year, reader.latest_year, True
+    return (
+        _select_year(current_year, latest_year, year),
+        max(latest_year, reader.latest_year),
+        False,
+    )
+
+
 def _read_year(
     reader: ReaderBase | None,
     inputter: type[ReaderBase],
@@ -123,6 +205,7 @@ def _read_year(
     latest_year: float | None,
     year: float | None,
     argv: list[str],
+    options: Options,
 ) -> tuple[float, float, bool, ReaderBase]:
     old_data_available = False
     if (
@@ -144,47 +227,524 @@ def _read_year(
         old_data_available = True
     else:
         reader = inputter(year=year)
-        if latest_year is None:
-            current_year = new_latest_year = reader.latest_year
-            old_data_available = True
-        else:
-            current_year = _select_year(current_year, latest_year, year)
-            new_latest_year = max(latest_year, reader.latest_year)
+        current_year, new_latest_year, old_data_available = _select_reader_year(
+            reader, current_year, latest_year, year
+        )
 
         LOGGER.debug("Reading year %d with reader %r", current_year, reader)
-        if isinstance(reader, Years):
-            reader.read_files(*_parse_year_args(reader, argv, current_year))
-        else:
-            reader.read()
+        with PROFILER.phase("read", current_year):
+            if isinstance(reader, Years):
+                reader.read_files(
+                    *_parse_year_args(reader, argv, current_year),
+                    snapshots=options.get("snapshots", False),
+                )
+            else:
+                reader.read()
 
     return current_year, new_latest_year, old_data_available, reader
 
 
+OutputTask = tuple[list[tuple[Format, str]], list[ReaderBase], float, bool]
+OutputResult = tuple[bool, Changes, dict[str, dict[str, Timing]]]
+
+# Formatters and readers of outputs that are written in worker processes,
+# which inherit them when the processes are forked
+_output_task: OutputTask | None = None
+
+
+def _write_output(
+    formatter: Format,
+    output_format: str,
+    readers: list[ReaderBase],
+    year: float,
+    old_data_available: bool = False,
+) -> bool:
+    LOGGER.info("Writing file format %s year %d", output_format, year)
+    manifest = Format.get_manifest()
+    name, inputs, settings = formatter.get_build(
+        readers, output_format, old_data_available
+    )
+    with (
+        PROFILER.phase(f"output_file/{output_format}", year),
+        manifest.build(name, inputs, settings),
+    ):
+        written = formatter.output_file(
+            readers.copy(),
+            output_format,
+            old_data_available=old_data_available,
+        )
+    if not written:
+        # Format the output again next time to report the problem again
+        manifest.forget(name)
+    return written
+
+
+def _is_up_to_date(
+    formatter: Format,
+    output_format: str,
+    readers: list[ReaderBase],
+    year: float,
+    old_data_available: bool = False,
+) -> bool:
+    if Format.get_manifest().is_built(
+        *formatter.get_build(readers, output_format, old_data_available)
+    ):
+        LOGGER.info("File format %s year %d is up to date", output_format, year)
+        return True
+    return False
+
+
+def _write_output_worker(index: int) -> OutputResult:
+    assert _output_task is not None, "Worker must be forked with output task"
+    formatters, readers, year, old_data_available = _output_task
+    formatter, output_format = formatters[index]
+    # Collect changes to the manifest and phase timings of this output only,
+    # which the main process merges
+    manifest = Format.get_manifest()
+    _ = manifest.collect_changes()
+    PROFILER.reset()
+    written = _write_output(
+        formatter, output_format, readers, year, old_data_available
+    )
+    return written, manifest.collect_changes(), PROFILER.report()["phases"]
+
+
+def _write_outputs(
+    formatters: list[tuple[Format, str]],
+    readers: list[ReaderBase],
+    year: float,
+    old_data_available: bool = False,
+    jobs: int = 1,
+) -> bool:
+    """
+    Write the outputs of formatters with their output names for a year.
+    The formatters share a cache which is filled with the data of the chart
+    of the year first. With more than one job, the outputs are then written
+    concurrently in worker processes, which are forked so that they share the
+    data of the readers and the cache. Worker processes write each output
+    even if another output could not be written, after which the first error
+    is raised. Outputs which were built before with the same inputs and
+    settings are skipped if their files are unchanged.
+    """
+
+    formatters = [
+        (formatter, output_format)
+        for formatter, output_format in formatters
+        if not _is_up_to_date(
+            formatter, output_format, readers, year, old_data_available
+        )
+    ]
+    for formatter, output_format in formatters:
+        formatter.prepare(readers, output_format)
+
+    if (
+        jobs <= 1
+        or len(formatters) <= 1
+        or "fork" not in get_all_start_methods()
+    ):
+        for formatter, output_format in formatters:
+            if not _write_output(
+                formatter, output_format, readers, year, old_data_available
+            ):
+                return False
+        return True
+
+    global _output_task
+    _output_task = (formatters, readers, year, old_data_available)
+    # Keep the garbage collector of worker processes from touching the shared
+    # objects, which would copy their memory pages
+    gc.freeze()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(formatters)),
+            mp_context=get_context("fork"),
+        ) as executor:
+            futures = [
+                executor.submit(_write_output_worker, index)
+                for index in range(len(formatters))
+            ]
+    finally:
+        _output_task = None
+        gc.unfreeze()
+
+    written = True
+    errors: list[BaseException] = []
+    manifest = Format.get_manifest()
+    for (_, output_format), future in zip(formatters, futures, strict=True):
+        error = future.exception()
+        if error is not None:
+            LOGGER.error(
+                "Writing file format %s year %d failed: %s",
+                output_format,
+                year,
+                error,
+            )
+            errors.append(error)
+            continue
+
+        output_written, changes, phases = future.result()
+        manifest.merge(changes)
+        PROFILER.merge(phases)
+        written = written and output_written
+
+    if errors:
+        raise errors[0]
+    return written
+
+
+def _create_formatters(
+    outputs: list[type[Format]], current_year: float, latest_year: float
+) -> list[tuple[Format, str]]:
+    return [
+        (
+            output(ReaderBase.first_year, current_year, latest_year),
+            output_format,
+        )
+        for output in outputs
+        for output_format in output.get_output_names()
+    ]
+
+
 def _write_year(
-    outputs: list[type[Format]],
+    formatters: list[tuple[Format, str]],
     readers: list[ReaderBase],
     current_year: float,
-    latest_year: float | None,
     old_data_available: bool = False,
+    jobs: int = 1,
 ) -> bool:
-    for output in outputs:
-        formatter = output(
-            ReaderBase.first_year,
+    """
+    Select the year for the formatters with a new cache for the chart of the
+    year and write their outputs.
+    """
+
+    cache = ChartCache()
+    for formatter, _ in formatters:
+        formatter.select_year(current_year, cache)
+    return _write_outputs(
+        formatters, readers, current_year, old_data_available, jobs
+    )
+
+
+def _main_years(
+    inputs: list[type[ReaderBase]],
+    outputs: list[type[Format]],
+    latest_year: float | None,
+    argv: list[str],
+    options: Options,
+    current_readers: list[ReaderBase],
+    keep: Collection[int] = (),
+) -> int:
+    """
+    Read the data of the latest year with each input and write the outputs of
+    the year, then of earlier years if old data is available. Multi-year
+    readers are reused for earlier years and formatters are created once.
+    The readers of the latest year are placed in `current_readers`. Readers
+    in it at the indexes in `keep` have read their data already and are
+    reused instead of reading the latest year again.
+    """
+
+    current_year = ReaderBase.first_year
+    years = deque((latest_year,))
+    old_data_available = False
+    readers: list[ReaderBase] = []
+    formatters: list[tuple[Format, str]] | None = None
+    while years:
+        year = years.popleft()
+
+        for index, (reader, inputter) in enumerate(
+            zip_longest(readers, inputs)
+        ):
+            if formatters is None and index in keep:
+                reader = current_readers[index]
+                current_year, latest_year, has_old_data = _select_reader_year(
+                    reader, current_year, latest_year, year
+                )
+                if reader.has_multiple_years:
+                    reader.year = current_year
+            else:
+                current_year, latest_year, has_old_data, reader = _read_year(
+                    reader,
+                    inputter,
+                    current_year,
+                    latest_year,
+                    year,
+                    argv,
+                    options,
+                )
+            old_data_available = old_data_available or has_old_data
+
+            readers[index : index + 1] = [reader]
+
+        if formatters is None:
+            # Keep readers of the latest year, single-year readers are replaced
+            current_readers[:] = readers
+            formatters = _create_formatters(
+                outputs,
+                current_year,
+                latest_year if latest_year is not None else current_year,
+            )
+
+        previous_year = year - 1 if year is not None else current_year - 1
+        if old_data_available and previous_year >= ReaderBase.first_year:
+            years.append(previous_year)
+
+        if not _write_year(
+            formatters,
+            readers,
             current_year,
-            latest_year if latest_year is not None else current_year,
+            old_data_available,
+            jobs=options.get("jobs", 1),
+        ):
+            return 1
+
+    return 0
+
+
+def _main_live(
+    outputs: list[type[Format]],
+    readers: list[ReaderBase],
+    latest_year: float | None,
+    argv: list[str],
+    interval: float,
+    jobs: int = 1,
+) -> int:
+    """
+    Poll the input files of the latest year, for example during the broadcast
+    of the chart. When they change, read the rows of new positions into the
+    multi-year readers and write the outputs of the latest year again.
+    """
+
+    current_year = (
+        latest_year
+        if latest_year is not None
+        else max(reader.latest_year for reader in readers)
+    )
+    output_latest_year = max(
+        current_year, *(reader.latest_year for reader in readers)
+    )
+    for reader in readers:
+        if reader.has_multiple_years:
+            reader.year = current_year
+    files = [
+        (reader, *_parse_year_args(reader, argv, current_year)[:2])
+        for reader in readers
+        if isinstance(reader, Years)
+    ]
+    watcher = Watcher(
+        Path(name)
+        for _, csv_name, json_name in files
+        for name in (csv_name, json_name)
+    )
+    LOGGER.info("Polling files of year %d for new positions", current_year)
+    try:
+        while True:
+            time.sleep(interval)
+            if not watcher.poll():
+                continue
+
+            with PROFILER.phase("update", current_year):
+                for reader, csv_name, json_name in files:
+                    reader.update_files(
+                        csv_name if Path(csv_name).exists() else None,
+                        json_name if Path(json_name).exists() else None,
+                    )
+            written = _write_year(
+                _create_formatters(outputs, current_year, output_latest_year),
+                readers,
+                current_year,
+                old_data_available=latest_year is None,
+                jobs=jobs,
+            )
+            Format.get_manifest().save()
+            if not written:
+                return 1
+    except KeyboardInterrupt:
+        return 0
+
+
+def _input_paths(
+    readers: list[ReaderBase], argv: list[str], latest_year: float | None
+) -> Iterator[Path]:
+    for reader in readers:
+        if isinstance(reader, Years):
+            current_csv, current_json, old = _parse_year_args(
+                reader,
+                argv,
+                latest_year if latest_year is not None else reader.latest_year,
+            )
+            yield Path(current_csv)
+            yield Path(current_json)
+            for _, csv_name, json_name in old:
+                yield Path(csv_name)
+                yield Path(json_name)
+
+
+def _load_field_sections() -> dict[str, object]:
+    with Path("fields.toml").open("rb") as fields_file:
+        return tomllib.load(fields_file)
+
+
+def _find_stale_readers(
+    readers: list[ReaderBase],
+    changed: set[Path],
+    sections: dict[str, object],
+) -> set[int]:
+    """
+    Determine the indexes of readers whose data is outdated by changes to
+    watched files, based on the normalization fixes, the sections of the field
+    settings that they use compared to the earlier `sections` and input files.
+    The `sections` are updated with the field settings in the file.
+    """
+
+    if Path("fixes.toml") in changed:
+        Normalizer.get_instance().reload()
+        return set(range(len(readers)))
+
+    stale: set[int] = set()
+    if Path("fields.toml") in changed:
+        new_sections = _load_field_sections()
+        changed_sections = {
+            name
+            for name in sections.keys() | new_sections.keys()
+            if sections.get(name) != new_sections.get(name)
+        }
+        LOGGER.info("Changed field settings: %s", ", ".join(changed_sections))
+        sections.clear()
+        sections.update(new_sections)
+        stale.update(
+            index
+            for index, reader in enumerate(readers)
+            if not changed_sections.isdisjoint(reader.field_sections)
+        )
+
+    if changed.difference(SETTINGS_FILES):
+        stale.update(
+            index
+            for index, reader in enumerate(readers)
+            if isinstance(reader, Years)
         )
-        for output_format in formatter.output_names:
-            LOGGER.info(
-                "Writing file format %s year %d", output_format, current_year
+
+    return stale
+
+
+def _wait_for_changes(
+    watcher: Watcher,
+    interval: float,
+    readers: list[ReaderBase],
+    outputs: list[type[Format]],
+    sections: dict[str, object],
+) -> set[int]:
+    """
+    Poll the watched files until changes outdate the data of some readers or
+    the settings of some outputs, or until any change if there are no readers
+    with data yet. The indexes of outdated readers are returned.
+    """
+
+    while True:
+        LOGGER.info("Watching settings and input files for changes")
+        while not (changed := watcher.poll()):
+            time.sleep(interval)
+
+        try:
+            settings_changed = False
+            if Path("output.toml") in changed:
+                for output in outputs:
+                    if output.reload_settings():
+                        settings_changed = True
+            stale = _find_stale_readers(readers, changed, sections)
+        except (OSError, tomllib.TOMLDecodeError):
+            LOGGER.exception("Could not load changed settings")
+            continue
+
+        if stale or settings_changed or not readers:
+            return stale
+
+
+def _main_watch(
+    inputs: list[type[ReaderBase]],
+    outputs: list[type[Format]],
+    latest_year: float | None,
+    argv: list[str],
+    options: Options,
+    interval: float,
+) -> int:
+    """
+    Read the data of all years once and write the outputs of all years, then
+    keep polling the settings files and input files. When they change, read
+    the data again only with the readers that are affected by the changes
+    and write the outputs again. Outputs whose inputs and settings did not
+    change are skipped. Snapshots are used so that files which did not change
+    are not parsed again. Errors while reading or writing are logged, after
+    which the next change is awaited.
+    """
+
+    readers: list[ReaderBase] = []
+    sections = _load_field_sections()
+    watcher = Watcher(SETTINGS_FILES)
+    watch_options: Options = {**options, "snapshots": True}
+    stale: set[int] = set()
+    try:
+        while True:
+            try:
+                if (
+                    _main_years(
+                        inputs,
+                        outputs,
+                        latest_year,
+                        argv,
+                        watch_options,
+                        readers,
+                        keep=set(range(len(readers))) - stale,
+                    )
+                    != 0
+                ):
+                    LOGGER.error("Not all outputs could be written")
+                stale = set()
+            except Exception:  # noqa: BLE001
+                # Readers that were not read again remain outdated
+                LOGGER.exception("Could not read data or write outputs")
+            Format.get_manifest().save()
+
+            # Watch input files even if the readers could not read them yet
+            watcher.watch(
+                _input_paths(
+                    readers
+                    or [
+                        inputter()
+                        for inputter in inputs
+                        if issubclass(inputter, Years)
+                    ],
+                    argv,
+                    latest_year,
+                )
             )
-            if not formatter.output_file(
-                readers.copy(),
-                output_format,
-                old_data_available=old_data_available,
-            ):
-                return False
+            stale |= _wait_for_changes(
+                watcher, interval, readers, outputs, sections
+            )
+            if stale:
+                LOGGER.info(
+                    "Reading again with inputs: %s",
+                    ", ".join(
+                        type(readers[index]).__name__ for index in sorted(stale)
+                    ),
+                )
+    except KeyboardInterrupt:
+        return 0
+
+
+def _write_profile(path: str) -> None:
+    """
+    Write the profiling report as JSON to a file, or to standard error if the
+    path is empty.
+    """
+
+    if path == "":
+        json.dump(PROFILER.report(), sys.stderr, indent=2)
+        print(file=sys.stderr)
+        return
 
-    return True
+    with Path(path).open("w", encoding="utf-8") as profile_file:
+        json.dump(PROFILER.report(), profile_file, indent=2)
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -198,10 +758,15 @@ def main(argv: list[str] | None = None) -> int:
     LOGGER.setLevel(logging.INFO)
 
     try:
+        argv, options = _parse_options(argv)
         argv, inputs, outputs, latest_year = _parse_first_args(deque(argv))
     except ValueError:
         print(
-            "Usage: python3 -m top2000 [inputs...] [outputs...] [latest_year]",
+            "Usage: python3 -m top2000 [options...]",
+            file=sys.stderr,
+        )
+        print(
+            "                          [inputs...] [outputs...] [latest_year]",
             file=sys.stderr,
         )
         print(
@@ -212,35 +777,39 @@ def main(argv: list[str] | None = None) -> int:
             "                          [old_year] [old_csv] [old_json] ...",
             file=sys.stderr,
         )
+        print(
+            "Options: --jobs=N --snapshots --profile[=PATH]",
+            file=sys.stderr,
+        )
+        print(
+            "         --live[=SECONDS] --watch[=SECONDS] --compress[=gz,zst]",
+            file=sys.stderr,
+        )
         return 0
 
-    current_year = ReaderBase.first_year
-    years = deque((latest_year,))
-    old_data_available = False
+    PROFILER.enabled = "profile" in options
+    Format.compression = options.get("compress", ())
     readers: list[ReaderBase] = []
-    while years:
-        year = years.popleft()
-
-        for index, (reader, inputter) in enumerate(
-            zip_longest(readers, inputs)
-        ):
-            current_year, latest_year, has_old_data, reader = _read_year(
-                reader, inputter, current_year, latest_year, year, argv
+    try:
+        if "watch" in options:
+            return _main_watch(
+                inputs, outputs, latest_year, argv, options, options["watch"]
             )
-            old_data_available = old_data_available or has_old_data
-
-            readers[index : index + 1] = [reader]
-
-        previous_year = year - 1 if year is not None else current_year - 1
-        if old_data_available and previous_year >= ReaderBase.first_year:
-            years.append(previous_year)
-
-        if not _write_year(
-            outputs, readers, current_year, latest_year, old_data_available
-        ):
-            return 1
-
-    return 0
+        code = _main_years(inputs, outputs, latest_year, argv, options, readers)
+        if code != 0 or "live" not in options:
+            return code
+        return _main_live(
+            outputs,
+            readers,
+            latest_year,
+            argv,
+            options["live"],
+            jobs=options.get("jobs", 1),
+        )
+    finally:
+        Format.get_manifest().save()
+        if "profile" in options:
+            _write_profile(options["profile"])
 
 
 if __name__ == "__main__":
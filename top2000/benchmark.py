@@ -0,0 +1,514 @@
+"""
+Benchmark the parsing pipeline on a synthetic corpus of chart files.
+"""
+
+import csv
+import json
+import logging
+import platform
+import random
+import shutil
+import sys
+import time
+from collections.abc import Callable
+from contextlib import chdir, redirect_stdout
+from datetime import UTC, datetime
+from io import StringIO
+from itertools import permutations
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import final
+
+from typing_extensions import TypedDict
+
+from . import __version__
+from .compare import main as compare_main
+from .logging import LOGGER
+from .normalization import Normalizer
+from .output.base import Format
+from .readers.base import Base as ReaderBase, FieldHolder, RowPath
+from .readers.multi import Years
+
+FIRST_NAMES = (
+    "Anouk",
+    "Bakker",
+    "Berg",
+    "Doe",
+    "Ilse",
+    "Jansen",
+    "John",
+    "Kees",
+    "Lisa",
+    "Marco",
+    "Mary",
+    "Müller",
+    "René",
+    "Smith",
+    "Vos",
+)
+WORDS = (
+    "Blauw",
+    "Bohemian",
+    "Café",
+    "Coaster",
+    "Dream",
+    "Été",
+    "Fire",
+    "Heart",
+    "Heaven",
+    "Hotel",
+    "Love",
+    "Nacht",
+    "Night",
+    "Rain",
+    "Rhapsody",
+    "River",
+    "Road",
+    "Roller",
+    "Sky",
+    "Stairway",
+    "Sun",
+    "Wind",
+    "Wit",
+    "Zwart",
+)
+SETTINGS = ("fields.toml", "fixes.toml", "output.toml")
+
+
+class Track(TypedDict):
+    """
+    Synthetic track in the corpus.
+    """
+
+    artist: str
+    title: str
+    year: int
+
+
+class Options(TypedDict, total=False):
+    """
+    Benchmark command line options.
+    """
+
+    years: int
+    size: int
+    seed: int
+    repeat: int
+
+
+class Phase(TypedDict):
+    """
+    Timing results of a benchmark phase in seconds.
+    """
+
+    runs: list[float]
+    best: float
+    mean: float
+
+
+@final
+class Corpus:
+    """
+    Deterministic generator of synthetic chart files in the layouts that the
+    field settings describe for each year.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        years: int = 12,
+        size: int = ReaderBase.expected_positions,
+        seed: int = 1,
+    ) -> None:
+        self._directory = directory
+        self._fields = FieldHolder()
+        self._random = random.Random(seed)  # noqa: S311
+        self.size: int = size
+        self.seed: int = seed
+
+        self.latest_year: int = int(max(self._fields))
+        self.first_csv_year: int = int(min(self._fields))
+        self.first_year: int = max(
+            int(ReaderBase.first_year), self.latest_year - years + 1
+        )
+
+        self.tracks: list[Track] = self._generate_tracks()
+        self._charts: dict[int, dict[int, int]] = self._generate_charts()
+
+    def _generate_artists(self) -> list[str]:
+        # Some artists are collaborations with another solo artist
+        solo = [" ".join(names) for names in permutations(FIRST_NAMES, 2)]
+        artists: dict[str, None] = {}
+        while len(artists) < self.size // 2:
+            artist = self._random.choice(solo)
+            choice = self._random.random()
+            if choice < 0.08:
+                artist += f" & {self._random.choice(solo)}"
+            elif choice < 0.12:
+                artist += f" feat. {self._random.choice(solo)}"
+            artists[artist] = None
+        return list(artists)
+
+    def _generate_tracks(self) -> list[Track]:
+        artists = self._generate_artists()
+        tracks: list[Track] = []
+        titles: set[str] = set()
+        while len(tracks) < self.size * 8 // 5:
+            title = " ".join(
+                self._random.choices(WORDS, k=self._random.randint(2, 4))
+            )
+            if title.lower() in titles:
+                continue
+            titles.add(title.lower())
+            if self._random.random() < 0.05:
+                title += " (Live)"
+            tracks.append(
+                {
+                    "artist": self._random.choice(artists),
+                    "title": title,
+                    "year": self._random.randint(1960, 2010),
+                }
+            )
+        return tracks
+
+    def _generate_charts(self) -> dict[int, dict[int, int]]:
+        # Years in the overview CSV are drawn from the same tracks, since
+        # these tracks are only matched through the overview
+        early = self._random.sample(range(len(self.tracks)), self.size)
+        charts: dict[int, dict[int, int]] = {}
+        for year in range(self.first_year - 1, self.latest_year + 1):
+            indexes = (
+                self._random.sample(early, self.size)
+                if year <= self.first_csv_year
+                else self._random.sample(range(len(self.tracks)), self.size)
+            )
+            charts[year] = {
+                index: position + 1 for position, index in enumerate(indexes)
+            }
+        return charts
+
+    def _has_json(self, year: int) -> bool:
+        return "json" in self._fields.get(year, {}) and not (
+            self._fields.get_bool_field(year, "json", "skip")
+        )
+
+    def write(self) -> None:
+        """
+        Write the settings and the CSV and JSON files of all years.
+        """
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+        for name in SETTINGS:
+            _ = shutil.copy(Path(name), self._directory / name)
+
+        for year in range(
+            max(self.first_year, self.first_csv_year), self.latest_year + 1
+        ):
+            if self._has_json(year):
+                self._write_json(year)
+            self._write_csv(year)
+
+    def _nest_rows(self, rows: object, path: RowPath) -> object:
+        nested = rows
+        for key_index in reversed(path):
+            if isinstance(key_index, str):
+                nested = {"count": self.size, key_index: nested}
+            else:
+                padding: list[object] = [[] for _ in range(key_index)]
+                nested = [*padding, nested]
+        return nested
+
+    def _write_json(self, year: int) -> None:
+        chart = sorted(self._charts[year].items(), key=lambda pair: pair[1])
+        previous = self._charts.get(year - 1, {})
+        rows: list[dict[str, object]] = []
+        if self._fields.get_bool_field(year, "json", "old"):
+            pos_field = self._fields.get_str_field(
+                year, "json", "pos", "position"
+            )
+            prv_field = self._fields.get_str_field(
+                year, "json", "prv", "lastPosition"
+            )
+            artist_field = self._fields.get_str_field(
+                year, "json", "artist", "artist"
+            )
+            title_field = self._fields.get_str_field(
+                year, "json", "title", "title"
+            )
+            year_field = self._fields.get_str_field(
+                year, "json", "year", "year"
+            )
+            for index, position in chart:
+                track = self.tracks[index]
+                rows.append(
+                    {
+                        pos_field: position,
+                        prv_field: previous.get(index, 0),
+                        artist_field: track["artist"],
+                        title_field: track["title"],
+                        year_field: track["year"],
+                    }
+                )
+        else:
+            start = int(datetime(year, 12, 25, tzinfo=UTC).timestamp()) * 1000
+            time_field = self._fields.get_str_field(
+                year, "json", "time", "broadcastUnixTime"
+            )
+            for index, position in chart:
+                track = self.tracks[index]
+                rows.append(
+                    {
+                        time_field: start + (self.size - position) * 240000,
+                        "position": {
+                            self._fields.get_str_field(
+                                year, "json", "pos", "current"
+                            ): position,
+                            self._fields.get_str_field(
+                                year, "json", "prv", "previous"
+                            ): previous.get(index, 0),
+                        },
+                        "track": {
+                            self._fields.get_str_field(
+                                year, "json", "artist", "artist"
+                            ): track["artist"],
+                            self._fields.get_str_field(
+                                year, "json", "title", "title"
+                            ): track["title"],
+                        },
+                    }
+                )
+
+        name = self._fields.get_str_field(
+            year, "json", "name", ReaderBase.json_name_format
+        )
+        path = self._directory / name.format(year)
+        with path.open("w", encoding="utf-8") as json_file:
+            json.dump(
+                self._nest_rows(
+                    rows, self._fields.get_path_field(year, "json", "rows")
+                ),
+                json_file,
+            )
+
+    def _write_csv(self, year: int) -> None:
+        chart = sorted(self._charts[year].items(), key=lambda pair: pair[1])
+        if self._has_json(year):
+            pos_field = self._fields.get_str_field(
+                year, "csv", "pos", "positie"
+            )
+            old_years: list[int] = []
+        else:
+            # Overview CSV with positions of earlier years if it is the first
+            pos_field = f"pos {year}"
+            old_years = (
+                list(range(self.first_year, year))
+                if year == self.first_csv_year
+                else []
+            )
+
+        header = [
+            pos_field,
+            self._fields.get_str_field(year, "csv", "artist", "artiest"),
+            self._fields.get_str_field(year, "csv", "title", "titel"),
+            self._fields.get_str_field(year, "csv", "year", "jaar"),
+            *(str(old_year) for old_year in old_years),
+        ]
+        name = self._fields.get_str_field(
+            year, "csv", "name", ReaderBase.csv_name_format
+        )
+        path = self._directory / name.format(year)
+        with path.open(
+            "w",
+            encoding=self._fields.get_str_field(
+                year, "csv", "encoding", "utf-8"
+            ),
+            newline="",
+        ) as csv_file:
+            for _ in range(self._fields.get_int_field(year, "csv", "skip")):
+                _ = csv_file.write(f"Top 2000 van {year}\n")
+            writer = csv.writer(
+                csv_file,
+                delimiter=self._fields.get_str_field(
+                    year, "csv", "delimiter", ","
+                ),
+            )
+            writer.writerow(header)
+            if year == self.latest_year:
+                writer.writerows(self._generate_current_rows(chart))
+                return
+
+            for index, position in chart:
+                track = self.tracks[index]
+                writer.writerow(
+                    [
+                        position,
+                        track["artist"],
+                        track["title"],
+                        track["year"],
+                        *(
+                            self._charts[old_year].get(index, 0)
+                            for old_year in old_years
+                        ),
+                    ]
+                )
+
+    def _generate_current_rows(
+        self, chart: list[tuple[int, int]]
+    ) -> list[list[str | int]]:
+        # Current year is in broadcast order with rows for each hour
+        rows: list[list[str | int]] = []
+        hour = 0
+        for index, position in reversed(chart):
+            if (self.size - position) % 15 == 0:
+                rows.append(["", "", f"25 dec {hour}-{hour + 1}", ""])
+                hour = (hour + 1) % 24
+            track = self.tracks[index]
+            rows.append(
+                [position, track["artist"], track["title"], track["year"]]
+            )
+        return rows
+
+
+def _measure(repeat: int, phase: Callable[[], object]) -> Phase:
+    runs: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _ = phase()
+        runs.append(time.perf_counter() - start)
+    return {"runs": runs, "best": min(runs), "mean": sum(runs) / len(runs)}
+
+
+def _read(corpus: Corpus) -> Years:
+    reader = Years(year=corpus.latest_year)
+    reader.read_files(
+        *reader.format_filenames(),
+        old=tuple(
+            (year, *reader.format_filenames(year=year))
+            for year in range(
+                corpus.latest_year - 1, corpus.first_csv_year - 1, -1
+            )
+        ),
+        snapshots=False,
+    )
+    return reader
+
+
+def _normalize(corpus: Corpus) -> None:
+    normalizer = Normalizer.get_instance()
+    normalizer.reload()
+    for track in corpus.tracks:
+        _ = normalizer.find_artist_alternatives(track["artist"])
+        _ = normalizer.find_title_alternatives(
+            normalizer.check_album_version(track["title"])
+        )
+
+
+def _output(corpus: Corpus, name: str, readers: list[ReaderBase]) -> None:
+    formatter = Format.get_format(name)(
+        ReaderBase.first_year, corpus.latest_year, corpus.latest_year
+    )
+    for output_format in formatter.output_names:
+        _ = formatter.output_file(
+            readers.copy(), output_format, old_data_available=True
+        )
+
+
+def _compare() -> None:
+    with redirect_stdout(StringIO()):
+        _ = compare_main(["output-sorted.json", "output-sorted.json"])
+
+
+def run(directory: Path, options: Options) -> dict[str, object]:
+    """
+    Generate a corpus in a directory and time the phases of the pipeline.
+    """
+
+    corpus = Corpus(
+        directory,
+        years=options.get("years", 12),
+        size=options.get("size", ReaderBase.expected_positions),
+        seed=options.get("seed", 1),
+    )
+    corpus.write()
+
+    repeat = options.get("repeat", 3)
+    phases: dict[str, Phase] = {}
+    with chdir(directory):
+        readers: list[ReaderBase] = [_read(corpus)]
+        phases["read"] = _measure(repeat, lambda: _read(corpus))
+        phases["normalize"] = _measure(repeat, lambda: _normalize(corpus))
+        phases["json"] = _measure(
+            repeat, lambda: _output(corpus, "json", readers)
+        )
+        phases["csv"] = _measure(
+            repeat, lambda: _output(corpus, "csv", readers)
+        )
+        phases["compare"] = _measure(repeat, _compare)
+
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "corpus": {
+            "first_year": corpus.first_year,
+            "latest_year": corpus.latest_year,
+            "size": corpus.size,
+            "seed": corpus.seed,
+        },
+        "repeat": repeat,
+        "phases": phases,
+    }
+
+
+def _parse_options(argv: list[str]) -> tuple[list[str], Options]:
+    arguments: list[str] = []
+    options: Options = {}
+    for argument in argv:
+        if not argument.startswith("--"):
+            arguments.append(argument)
+            continue
+
+        name, _, value = argument[2:].partition("=")
+        match name:
+            case "years" | "size" | "seed" | "repeat":
+                options[name] = int(value)
+            case _:
+                raise ValueError(f"Unknown option: {argument}")
+
+    return arguments, options
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Main entry point for benchmarks.
+    """
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    try:
+        arguments, options = _parse_options(argv)
+    except ValueError:
+        print(
+            "Usage: python3 -m top2000.benchmark [options...] [directory]",
+            file=sys.stderr,
+        )
+        print(
+            "Options: --years=N --size=N --seed=N --repeat=N",
+            file=sys.stderr,
+        )
+        return 0
+
+    LOGGER.setLevel(logging.WARNING)
+    if arguments:
+        results = run(Path(arguments[0]), options)
+    else:
+        with TemporaryDirectory() as directory:
+            results = run(Path(directory), options)
+
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
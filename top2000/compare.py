@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import cast
 
 from .normalization import Normalizer
+from .output.columnar import Columnar
 from .output.json import JSON, Dump, Track
 from .readers.base import Base as ReaderBase
 
@@ -60,6 +61,13 @@ def _compare_fields(first: Track, second: Track, formatter: JSON) -> list[str]:
     return errors
 
 
+def _load_dump(path: Path) -> Dump:
+    if path.name.endswith(".columnar.json"):
+        return Columnar.load(path)
+    with path.open("r", encoding="utf-8") as dump_file:
+        return cast(Dump, json.load(dump_file))
+
+
 def main(argv: list[str] | None = None) -> int:
     """
     Main entry point for JSON comparison.
@@ -78,39 +86,33 @@ def main(argv: list[str] | None = None) -> int:
     one = Path(argv[0])
     two = Path(argv[1] if len(argv) >= 2 else "output-sorted.json")
     errors = 0
-    with (
-        one.open("r", encoding="utf-8") as first_file,
-        two.open("r", encoding="utf-8") as second_file,
+    first = _load_dump(one)
+    second = _load_dump(two)
+    formatter = JSON(
+        first["first_year"],
+        first["year"],
+        first.get("latest_year", first["year"]),
+    )
+    for index, (first_track, second_track) in enumerate(
+        zip_longest(first["tracks"], second["tracks"])
     ):
-        first = cast(Dump, json.load(first_file))
-        second = cast(Dump, json.load(second_file))
-        formatter = JSON(
-            first["first_year"],
-            first["year"],
-            first.get("latest_year", first["year"]),
-        )
-        for index, (first_track, second_track) in enumerate(
-            zip_longest(first["tracks"], second["tracks"])
-        ):
-            if first_track is None:
-                print(f"Missing track in {one} at {index}", file=sys.stderr)
-                errors += 1
-            elif second_track is None:
-                print(f"Missing track in {two} at {index}", file=sys.stderr)
-                errors += 1
-            else:
-                track_errors = _compare_fields(
-                    first_track, second_track, formatter
+        if first_track is None:
+            print(f"Missing track in {one} at {index}", file=sys.stderr)
+            errors += 1
+        elif second_track is None:
+            print(f"Missing track in {two} at {index}", file=sys.stderr)
+            errors += 1
+        else:
+            track_errors = _compare_fields(first_track, second_track, formatter)
+            if track_errors:
+                print(
+                    f"Differences between tracks {first_track!r} and "
+                    + f"{second_track!r} at {index}:\n- ",
+                    end="",
+                    file=sys.stderr,
                 )
-                if track_errors:
-                    print(
-                        f"Differences between tracks {first_track!r} and "
-                        + f"{second_track!r} at {index}:\n- ",
-                        end="",
-                        file=sys.stderr,
-                    )
-                    print("\n- ".join(track_errors), file=sys.stderr)
-                    errors += len(track_errors)
+                print("\n- ".join(track_errors), file=sys.stderr)
+                errors += len(track_errors)
 
     print(f"Detected {errors} errors")
     return errors
@@ -3,8 +3,11 @@ Logging of parsing handling.
 """
 
 import logging
+import os
 import re
+from collections.abc import Iterable, Mapping
 from logging.config import dictConfig
+from pathlib import Path
 from typing import Protocol
 
 from typing_extensions import override
@@ -24,27 +27,70 @@ class Logger(logging.Logger):
     Logging interface.
     """
 
+    trace_level: int = logging.INFO
+
+    def __init__(self, name: str, level: int | str = logging.NOTSET) -> None:
+        super().__init__(name, level)
+        self._watch: re.Pattern[str] | None = None
+        self.tracing: bool = False
+
+    @override
+    def setLevel(self, level: int | str) -> None:
+        super().setLevel(level)
+        self._update_tracing()
+
+    def _update_tracing(self) -> None:
+        self.tracing = self._watch is not None and self.isEnabledFor(
+            self.trace_level
+        )
+
+    def watch(self, names: Iterable[str]) -> None:
+        """
+        Trace parsing of artists and titles which contain any of the names,
+        regardless of case. Tracing is disabled if there are no names.
+        """
+
+        patterns = [re.escape(name.strip().lower()) for name in names]
+        patterns = [pattern for pattern in patterns if pattern != ""]
+        self._watch = re.compile("|".join(patterns)) if patterns else None
+        self._update_tracing()
+
+    def watch_environment(
+        self, environ: Mapping[str, str] = os.environ
+    ) -> None:
+        """
+        Trace names from the `TOP2000_TRACE` environment variable, separated
+        by semicolons, and from the lines of the file that the environment
+        variable `TOP2000_TRACE_FILE` refers to, except for comment lines.
+        A trace file that cannot be read is skipped with a warning.
+        """
+
+        names = environ.get("TOP2000_TRACE", "").split(";")
+        if (trace_path := environ.get("TOP2000_TRACE_FILE", "")) != "":
+            try:
+                with Path(trace_path).open("r", encoding="utf-8") as trace_file:
+                    names.extend(
+                        line for line in trace_file if not line.startswith("#")
+                    )
+            except OSError as error:
+                self.warning(
+                    "Could not read trace file %s: %s", trace_path, error
+                )
+        self.watch(names)
+
     def track(
-        self,
-        field: str,
-        search: str | tuple[str, ...] | re.Pattern[str],
-        *context: Representable | None,
-        level: int = logging.DEBUG,
+        self, point: str, field: str, *context: Representable | None
     ) -> None:
         """
-        Track information when a field matches a search pattern.
+        Trace information at a point of the parsing when a field, such as an
+        artist or title, contains one of the watched names. Callers should
+        check `tracing` before building the field and context, so that there
+        is no cost when tracing is disabled. The context is only formatted
+        when a name matches.
         """
 
-        if self.isEnabledFor(level):
-            match search:
-                case str(_):
-                    hit = field in search
-                case tuple(_):
-                    hit = any(field in part for part in search)
-                case re.Pattern():
-                    hit = search.search(field) is not None
-            if hit:
-                self._log(level, "%s: %r", (field, context))
+        if self._watch is not None and self._watch.search(field.lower()):
+            self._log(self.trace_level, "%s %s: %r", (point, field, context))
 
 
 dictConfig(
@@ -79,3 +125,4 @@ handler.setFormatter(
     )
 )
 LOGGER.addHandler(handler)
+LOGGER.watch_environment()
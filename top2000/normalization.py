@@ -2,10 +2,138 @@
 Artist and song track title normalization and alternative key generation.
 """
 
+import hashlib
 import re
 import tomllib
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
-from typing import Literal
+from typing import ClassVar, Generic, Literal, TypeVar
+
+T = TypeVar("T")
+
+
+class Memo(Generic[T]):
+    """
+    Bounded memoization of results for input strings, which evicts the least
+    recently used result when it is full.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize: int = maxsize
+        self._results: OrderedDict[str, T] = OrderedDict()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def get(self, text: str, compute: Callable[[str], T]) -> T:
+        """
+        Retrieve the result for the input string `text`, which is computed
+        using `compute` if it is not memoized.
+        """
+
+        try:
+            result = self._results[text]
+        except KeyError:
+            self._misses += 1
+            result = compute(text)
+            self._results[text] = result
+            if len(self._results) > self._maxsize:
+                _ = self._results.popitem(last=False)
+        else:
+            self._hits += 1
+            self._results.move_to_end(text)
+
+        return result
+
+    def clear(self) -> None:
+        """
+        Remove all memoized results and reset the counters.
+        """
+
+        self._results.clear()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        Retrieve counters of the memoization: the number of hits and misses as
+        well as the current and maximum number of results.
+        """
+
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "size": len(self._results),
+            "maxsize": self._maxsize,
+        }
+
+
+class Matcher:
+    """
+    Multi-pattern substring matcher compiled from a list of patterns, with
+    optional replacements for each pattern.
+    """
+
+    def __init__(
+        self, patterns: Iterable[str], replacements: Iterable[str] = ()
+    ) -> None:
+        self._patterns: tuple[str, ...] = tuple(patterns)
+        self._replacements: tuple[str, ...] = tuple(replacements)
+
+    @property
+    def patterns(self) -> tuple[str, ...]:
+        """
+        Retrieve the patterns in their original order.
+        """
+
+        return self._patterns
+
+    @property
+    def replacements(self) -> tuple[str, ...]:
+        """
+        Retrieve the replacements of the patterns in their original order.
+        """
+
+        return self._replacements
+
+    def find(self, text: str, start: int = 0) -> list[int]:
+        """
+        Find indexes of patterns, starting from the index `start`, which occur
+        in the `text`. The indexes are in the original order of the patterns.
+        """
+
+        patterns = self._patterns
+        return [
+            index
+            for index in range(start, len(patterns))
+            if patterns[index] in text
+        ]
+
+    def replace(self, text: str) -> Iterator[tuple[str, str]]:
+        """
+        Replace patterns in order in the `text` for as long as they occur in
+        the text after earlier replacements. After each replacement, provide
+        the adjusted text and the replacement.
+        """
+
+        found = self.find(text)
+        while found:
+            index = found[0]
+            replacement = self._replacements[index]
+            text = text.replace(self._patterns[index], replacement)
+            yield text, replacement
+            found = self.find(text, start=index + 1)
+
+    def replace_all(self, text: str) -> str:
+        """
+        Replace patterns in order in the `text` and return the adjusted text.
+        """
+
+        for replaced, _ in self.replace(text):
+            text = replaced
+
+        return text
 
 
 class Normalizer:
@@ -15,6 +143,8 @@ class Normalizer:
 
     _instance: "Normalizer | None" = None
 
+    cache_size: ClassVar[int] = 16384
+
     @classmethod
     def get_instance(cls) -> "Normalizer":
         """
@@ -26,10 +156,23 @@ class Normalizer:
         return cls._instance
 
     def __init__(self) -> None:
-        with Path("fixes.toml").open("rb") as fixes_file:
-            self._fixes: dict[str, dict[str, list[str] | dict[str, str]]] = (
-                tomllib.load(fixes_file)
-            )
+        self._album_versions: Memo[str] = Memo(self.cache_size)
+        self._splits: Memo[tuple[tuple[str, ...], int]] = Memo(self.cache_size)
+        self._artist_alternatives: Memo[tuple[str, ...]] = Memo(self.cache_size)
+        self._title_alternatives: Memo[tuple[str, ...]] = Memo(self.cache_size)
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Load the normalization fixes settings file again and discard any
+        memoized results based on earlier settings.
+        """
+
+        fixes = Path("fixes.toml").read_bytes()
+        self._fixes_hash: str = hashlib.sha256(fixes).hexdigest()
+        self._fixes: dict[str, dict[str, list[str] | dict[str, str]]] = (
+            tomllib.loads(fixes.decode("utf-8"))
+        )
 
         self._replaces: dict[int, str] = str.maketrans(
             self._get_mapping("replaces")
@@ -38,6 +181,50 @@ class Normalizer:
             re.escape(split) for split in self._get_list("artist_splits")
         )
         self._artist_splits: re.Pattern[str] = re.compile(f"({artist_splits})")
+        self._artist_no_splits: frozenset[str] = frozenset(
+            self._get_list("artist_no_splits")
+        )
+
+        self._removes: Matcher = Matcher(self._get_list("removes"))
+        self._title_fixes: dict[str, str] = self._get_mapping("title_fixes")
+        self._album_version: Matcher = Matcher(self._get_list("album_version"))
+        self._album_version_replaces: Matcher = self._get_matcher(
+            "album_version_replaces"
+        )
+        self._artist_groups: Matcher = self._get_matcher("artist_groups")
+        self._artist_split_replaces: Matcher = self._get_matcher(
+            "artist_split_replaces"
+        )
+        self._artist_replaces: Matcher = self._get_matcher("artist_replaces")
+        self._artist_full_replaces: dict[str, str] = self._get_mapping(
+            "artist_full_replaces"
+        )
+
+        self._album_versions.clear()
+        self._splits.clear()
+        self._artist_alternatives.clear()
+        self._title_alternatives.clear()
+
+    @property
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Retrieve counters of memoized results of normalization methods.
+        """
+
+        return {
+            "album_versions": self._album_versions.stats,
+            "artist_splits": self._splits.stats,
+            "artist_alternatives": self._artist_alternatives.stats,
+            "title_alternatives": self._title_alternatives.stats,
+        }
+
+    @property
+    def fixes_hash(self) -> str:
+        """
+        Retrieve a hash of the normalization fixes settings file contents.
+        """
+
+        return self._fixes_hash
 
     def _get_list(self, name: str) -> list[str]:
         items = self._fixes[name]["items"]
@@ -49,6 +236,10 @@ class Normalizer:
         assert isinstance(mapping, dict), f"{name} must be a dict"
         return mapping
 
+    def _get_matcher(self, name: str) -> Matcher:
+        mapping = self._get_mapping(name)
+        return Matcher(mapping.keys(), mapping.values())
+
     def find_alternatives(self, text: str) -> set[str]:
         """
         Find alternative names that could have been used in earlier years or
@@ -56,10 +247,10 @@ class Normalizer:
         artitst or title.
         """
 
+        removes = self._removes.patterns
         alternatives = {
-            text.replace(remove, "")
-            for remove in self._get_list("removes")
-            if remove in text
+            text.replace(removes[index], "")
+            for index in self._removes.find(text)
         }
         alternatives.add(text.translate(self._replaces))
         alternatives.discard(text)
@@ -73,9 +264,17 @@ class Normalizer:
         as last argument.
         """
 
+        return list(
+            self._title_alternatives.get(
+                title,
+                lambda text: tuple(self._find_title_alternatives(text)),
+            )
+        )
+
+    def _find_title_alternatives(self, title: str) -> list[str]:
         title = title.translate(self._replaces)
 
-        title_fixes = self._get_mapping("title_fixes")
+        title_fixes = self._title_fixes
         if title in title_fixes:
             return [title_fixes[title]]
 
@@ -102,14 +301,11 @@ class Normalizer:
         if this is the case.
         """
 
-        if (
-            "(" in title
-            and ")" in title
-            and any(part in title for part in self._get_list("album_version"))
-        ):
-            replaces = self._get_mapping("album_version_replaces")
-            for search, replace in replaces.items():
-                title = title.replace(search, replace)
+        return self._album_versions.get(title, self._check_album_version)
+
+    def _check_album_version(self, title: str) -> str:
+        if "(" in title and ")" in title and self._album_version.find(title):
+            title = self._album_version_replaces.replace_all(title)
 
         return title
 
@@ -124,13 +320,17 @@ class Normalizer:
         second return value provides a count of splits found.
         """
 
+        splits, split_count = self._splits.get(artist, self._find_artist_splits)
+        return dict.fromkeys(splits, True), split_count
+
+    def _find_artist_splits(self, artist: str) -> tuple[tuple[str, ...], int]:
         alternatives: dict[str, Literal[True]] = {}
         parts = self._artist_splits.split(artist)
         split_count = len(parts[::2]) - 1
         if split_count == 0:
-            return alternatives, split_count
+            return (), split_count
 
-        keep = self._get_list("artist_no_splits")
+        keep = self._artist_no_splits
         for index, part in enumerate(parts[::2]):
             two = index * 2
             if index > 0 and f"{parts[two - 2]}{parts[two - 1]}{part}" in keep:
@@ -151,7 +351,7 @@ class Normalizer:
         alternative = "".join(parts[::-1])
         alternatives[alternative] = True
 
-        return alternatives, split_count
+        return tuple(alternatives), split_count
 
     def find_artist_alternatives(self, artist: str) -> list[str]:
         """
@@ -161,33 +361,39 @@ class Normalizer:
         includes the preferred artist name as the last element.
         """
 
+        return list(
+            self._artist_alternatives.get(
+                artist,
+                lambda text: tuple(self._find_artist_alternatives(text)),
+            )
+        )
+
+    def _find_artist_alternatives(self, artist: str) -> list[str]:
         artist = artist.translate(self._replaces)
 
-        if artist in self._get_list("artist_no_splits"):
+        if artist in self._artist_no_splits:
             # Do not generate any splits
             return [artist]
 
         alternatives, split_count = self.find_artist_splits(artist)
 
-        for search, group in self._get_mapping("artist_groups").items():
-            if search in artist:
-                alternatives[group] = True
+        groups = self._artist_groups.replacements
+        for index in self._artist_groups.find(artist):
+            alternatives[groups[index]] = True
 
-        for find, split in self._get_mapping("artist_split_replaces").items():
-            if find in artist:
-                artist = artist.replace(find, split)
-                alternatives[artist] = True
+        for split_artist, _ in self._artist_split_replaces.replace(artist):
+            artist = split_artist
+            alternatives[artist] = True
 
-        for search, replace in self._get_mapping("artist_replaces").items():
-            if search in artist:
-                artist = artist.replace(search, replace)
-                alternatives[artist] = True
-                alternatives[replace] = True
+        for replaced_artist, replace in self._artist_replaces.replace(artist):
+            artist = replaced_artist
+            alternatives[artist] = True
+            alternatives[replace] = True
 
         for alternative in self.find_alternatives(artist):
             alternatives[alternative] = True
 
-        artist_full_replaces = self._get_mapping("artist_full_replaces")
+        artist_full_replaces = self._artist_full_replaces
         old_artist = artist
         artist = artist_full_replaces.get(artist, artist)
         if artist != old_artist and split_count == 0:
@@ -3,7 +3,9 @@ Output formats for customized Top 2000 charts.
 """
 
 from .base import Format
+from .columnar import Columnar
 from .csv import CSV
 from .json import JSON
+from .shards import Shards
 
-__all__ = ["Format", "CSV", "JSON"]
+__all__ = ["Format", "CSV", "Columnar", "JSON", "Shards"]
@@ -2,14 +2,18 @@
 Base settings-based output format.
 """
 
+import hashlib
+import json
 import tomllib
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager
 from pathlib import Path
-from typing import ClassVar, TypeVar
+from typing import ClassVar, TextIO, TypeVar
 
 from ..logging import LOGGER
 from ..readers.base import Artists, Base as ReaderBase, Key, Positions
+from .manifest import Manifest
 
 Setting = int | bool | dict[str, str]
 Settings = dict[str, dict[str, Setting]]
@@ -18,6 +22,144 @@ KeyPair = tuple[int, list[Key]]
 FormatT = TypeVar("FormatT", bound=type["Format"])
 
 
+class ChartCache:
+    """
+    Output data for the chart of a year which is shared between formatters,
+    such as sorted positions and artist chart lookups of readers.
+    """
+
+    def __init__(self) -> None:
+        self._sorted: dict[
+            tuple[int, bool], tuple[Positions, list[KeyPair]]
+        ] = {}
+        self._artist_keys: dict[
+            tuple[int, int], tuple[Artists, Sequence[Key], str | None]
+        ] = {}
+        self._artist_ranks: dict[
+            int, tuple[Artists, dict[str, dict[int, int]]]
+        ] = {}
+
+    def sort_positions(
+        self, positions: Positions, reverse: bool = False
+    ) -> list[KeyPair]:
+        """
+        Retrieve the position numbers and keys of a reader in sorted order.
+        The returned list must not be altered.
+        """
+
+        cache_key = (id(positions), reverse)
+        if cache_key not in self._sorted:
+            self._sorted[cache_key] = (
+                positions,
+                sorted(
+                    positions.items(),
+                    key=lambda pair: -pair[0] if reverse else pair[0],
+                ),
+            )
+        return self._sorted[cache_key][1]
+
+    def index_artist_charts(
+        self, artists: Artists
+    ) -> dict[str, dict[int, int]]:
+        """
+        Retrieve the ranks of the positions in each artist chart, starting from
+        zero. The ranks of all artist charts are indexed at once upon first use.
+        """
+
+        cached = self._artist_ranks.get(id(artists))
+        if cached is None:
+            cached = (
+                artists,
+                {
+                    artist_key: {
+                        chart_position: rank
+                        for rank, chart_position in enumerate(chart)
+                    }
+                    for artist_key, chart in artists.items()
+                },
+            )
+            self._artist_ranks[id(artists)] = cached
+
+        return cached[1]
+
+    def rank_artist_chart(
+        self, position: int, artist: str, artists: Artists
+    ) -> tuple[int, int] | None:
+        """
+        Retrieve the rank of a position within the chart of an artist, starting
+        from zero, as well as the number of tracks in the chart. If the artist
+        or the position is not in the artist charts, then `None` is returned.
+        """
+
+        ranks = self.index_artist_charts(artists).get(artist)
+        if ranks is None or position not in ranks:
+            return None
+        return ranks[position], len(artists[artist])
+
+    def find_artist_chart(
+        self, position: int, keys: Sequence[Key], artists: Artists
+    ) -> str | None:
+        """
+        Retrieve the artist key of the most relevant artist chart for a track
+        at a position with alternative keys.
+        """
+
+        cache_key = (id(artists), position)
+        cached = self._artist_keys.get(cache_key)
+        if cached is not None and cached[1] is keys:
+            return cached[2]
+
+        max_artist_key = self._search_artist_chart(position, keys, artists)
+        self._artist_keys[cache_key] = (artists, keys, max_artist_key)
+        return max_artist_key
+
+    def _search_artist_chart(
+        self, position: int, keys: Sequence[Key], artists: Artists
+    ) -> str | None:
+        max_tracks = 0
+        max_artist_key = None
+        max_position = 0
+        for possible_key in keys:
+            if LOGGER.tracing:
+                LOGGER.track(
+                    "artist chart search",
+                    possible_key[1],
+                    possible_key,
+                    max_tracks,
+                    max_artist_key,
+                    artists.get(possible_key[0]),
+                )
+            if possible_key[0] not in artists:
+                continue
+            rank = self.rank_artist_chart(position, possible_key[0], artists)
+            if rank is None:
+                LOGGER.debug(
+                    "Missing artist chart of key %s for position %d",
+                    possible_key[0],
+                    position,
+                )
+                continue
+            track_position, num_tracks = rank
+            if LOGGER.tracing:
+                LOGGER.track(
+                    "artist chart rank",
+                    possible_key[1],
+                    possible_key,
+                    num_tracks,
+                    track_position,
+                    max_tracks,
+                    max_position,
+                )
+            if num_tracks > max_tracks or (
+                num_tracks == max_tracks and track_position > max_position
+            ):
+                max_tracks = num_tracks
+                max_artist_key = possible_key[0]
+                max_position = track_position
+
+        return max_artist_key
+
+
 class Format(ABC):
     """
     Output formatter.
@@ -28,6 +170,9 @@ class Format(ABC):
     _output_settings: ClassVar[
         dict[str, dict[str, dict[str, Setting]]] | None
     ] = None
+    _manifest: ClassVar[Manifest | None] = None
+    _code_digest: ClassVar[str | None] = None
+    compression: ClassVar[tuple[str, ...]] = ()
 
     @classmethod
     def register(cls, name: str) -> Callable[[FormatT], FormatT]:
@@ -57,16 +202,50 @@ class Format(ABC):
                 cls._output_settings = tomllib.load(settings_file)
         return cls._output_settings.get(cls._keys[cls], {})
 
+    @classmethod
+    def reload_settings(cls) -> set[str]:
+        """
+        Load the output settings file again for this format and retrieve the
+        output names whose settings were changed, added or removed.
+        """
+
+        old_settings = cls._load_settings()
+        cls._output_settings = None
+        new_settings = cls._load_settings()
+        return {
+            name
+            for name in old_settings.keys() | new_settings.keys()
+            if old_settings.get(name) != new_settings.get(name)
+        }
+
     def __init__(
-        self, first_year: float, current_year: float, latest_year: float
+        self,
+        first_year: float,
+        current_year: float,
+        latest_year: float,
+        cache: ChartCache | None = None,
     ) -> None:
         self._first_year: int = int(first_year)
-        self._current_year: int = int(current_year)
         self._latest_year: int = int(latest_year)
         self._settings: Settings = self._load_settings()
+        self._current_year: int = int(current_year)
+        self._cache: ChartCache = ChartCache()
+        self.select_year(current_year, cache)
 
         self.reset()
 
+    def select_year(
+        self, current_year: float, cache: ChartCache | None = None
+    ) -> None:
+        """
+        Update the year to output charts for. If a `cache` is provided, then
+        data for the chart of the year is shared with other formatters that
+        use the same cache; the cache must only be used for this year.
+        """
+
+        self._current_year = int(current_year)
+        self._cache = ChartCache() if cache is None else cache
+
     @property
     def output_names(self) -> tuple[str, ...]:
         """
@@ -75,6 +254,15 @@ class Format(ABC):
 
         return tuple(self._settings.keys())
 
+    @classmethod
+    def get_output_names(cls) -> tuple[str, ...]:
+        """
+        Retrieve the output names relevant for this format from the current
+        output settings.
+        """
+
+        return tuple(cls._load_settings().keys())
+
     def _get_int_setting(
         self, output_format: str, key: str, default: int = 0
     ) -> int:
@@ -94,6 +282,83 @@ class Format(ABC):
         assert isinstance(setting, dict), f"{key} must be a mapping"
         return setting.copy()
 
+    @staticmethod
+    def get_manifest() -> Manifest:
+        """
+        Retrieve the output manifest that records the written output files.
+        """
+
+        if Format._manifest is None:
+            Format._manifest = Manifest()
+        return Format._manifest
+
+    @staticmethod
+    def _get_code_digest() -> str:
+        if Format._code_digest is None:
+            algo = hashlib.sha256()
+            package = Path(__file__).parent.parent
+            for path in sorted(package.rglob("*.py")):
+                algo.update(f"{path.relative_to(package)}\0".encode())
+                algo.update(path.read_bytes())
+            Format._code_digest = algo.hexdigest()
+        return Format._code_digest
+
+    def get_build(
+        self,
+        readers: list[ReaderBase],
+        output_format: str,
+        old_data_available: bool = False,
+    ) -> tuple[str, str, str]:
+        """
+        Retrieve the name of the build of an output in the output manifest,
+        along with digests of the inputs of the readers and the settings that
+        the output is formatted with. If both digests are the same as when the
+        output was last built, then formatting it again has the same result.
+        """
+
+        inputs = {
+            "code": self._get_code_digest(),
+            "readers": [
+                (type(reader).__name__, reader.year, reader.inputs)
+                for reader in readers
+            ],
+            "old_data_available": old_data_available,
+        }
+        settings = {
+            "output": self._settings.get(output_format),
+            "compression": Format.compression,
+            "years": (self._first_year, self._latest_year),
+        }
+        return (
+            f"{self._keys[type(self)]}/{output_format}/{self._current_year}",
+            hashlib.sha256(
+                json.dumps(inputs, sort_keys=True).encode()
+            ).hexdigest(),
+            hashlib.sha256(
+                json.dumps(settings, sort_keys=True).encode()
+            ).hexdigest(),
+        )
+
+    @staticmethod
+    def _open_output(path: Path) -> AbstractContextManager[TextIO]:
+        """
+        Open an output file for writing, which is only replaced if the written
+        contents differ from the contents recorded in the output manifest.
+        Compressed copies are written alongside it for the suffixes in
+        `Format.compression`.
+        """
+
+        return Format.get_manifest().open(path, Format.compression)
+
+    @staticmethod
+    def _remove_output(path: Path) -> None:
+        """
+        Remove an output file that is no longer written, along with its
+        compressed copies.
+        """
+
+        Format.get_manifest().remove(path)
+
     def reset(self) -> None:
         """
         Reset current output format state.
@@ -104,6 +369,19 @@ class Format(ABC):
 
         self._last_position: int | None = None
 
+    def prepare(self, readers: list[ReaderBase], output_format: str) -> None:
+        """
+        Fill the cache with the data of the chart of the year that is used to
+        output a file in the given output format, such as sorted positions and
+        artist chart lookups of readers, so that formatters which share the
+        cache can then output their files concurrently.
+        """
+
+        reverse = self._get_bool_setting(output_format, "reverse")
+        for reader in readers:
+            _ = self._sort_positions(reader.positions, reverse)
+            _ = self._cache.index_artist_charts(reader.artists)
+
     @abstractmethod
     def output_file(
         self,
@@ -122,9 +400,7 @@ class Format(ABC):
     def _sort_positions(
         self, positions: Positions, reverse: bool = False
     ) -> list[KeyPair]:
-        return sorted(
-            positions.items(), key=lambda pair: -pair[0] if reverse else pair[0]
-        )
+        return self._cache.sort_positions(positions, reverse)
 
     def _check_position(self, position: int, reverse: bool = False) -> None:
         if self._last_position is not None:
@@ -137,48 +413,7 @@ class Format(ABC):
 
         self._last_position = position
 
-    @staticmethod
     def _find_artist_chart(
-        position: int, keys: Sequence[Key], artists: Artists
+        self, position: int, keys: Sequence[Key], artists: Artists
     ) -> str | None:
-        max_tracks = 0
-        max_artist_key = None
-        max_position = 0
-        for possible_key in keys:
-            LOGGER.track(
-                "we all stand together",
-                possible_key[1],
-                possible_key,
-                max_tracks,
-                max_artist_key,
-                artists.get(possible_key[0]),
-            )
-            if possible_key[0] not in artists:
-                continue
-            num_tracks = len(artists[possible_key[0]])
-            try:
-                track_position = artists[possible_key[0]].index(position)
-            except ValueError:
-                LOGGER.debug(
-                    "Missing artist chart of key %s for position %d",
-                    possible_key[0],
-                    position,
-                )
-                continue
-            LOGGER.track(
-                possible_key[1],
-                "als ik je weer zie",
-                possible_key,
-                num_tracks,
-                track_position,
-                max_tracks,
-                max_position,
-            )
-            if num_tracks > max_tracks or (
-                num_tracks == max_tracks and track_position > max_position
-            ):
-                max_tracks = num_tracks
-                max_artist_key = possible_key[0]
-                max_position = track_position
-
-        return max_artist_key
+        return self._cache.find_artist_chart(position, keys, artists)
@@ -0,0 +1,248 @@
+"""
+Columnar JSON dump output.
+"""
+
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import ClassVar, cast, final
+
+from typing_extensions import TypedDict, override
+
+from ..readers.base import Base as ReaderBase, Key, Row, RowElement
+from .base import Format
+from .json import JSON, Dump, Track
+
+Column = list[RowElement | None]
+
+
+class ColumnData(TypedDict, total=False):
+    """
+    Columnar format of tracks or subtracks.
+    """
+
+    fields: dict[str, Column]
+    subtracks: dict[str, "ColumnData"]
+    absent: list[int]
+
+
+class HistoryData(TypedDict):
+    """
+    Columnar format of the positions of tracks in earlier years.
+    """
+
+    years: list[str]
+    positions: list[list[int]]
+
+
+@final
+class ColumnSet:
+    """
+    Columns of values of fields of tracks, where a missing field of a track is
+    indicated by `None`. Fields with objects are subtracks, which have their
+    own columns, and artist names are encoded as indexes in a shared list.
+    """
+
+    ENCODED_FIELDS: ClassVar[frozenset[str]] = frozenset({"artist"})
+
+    def __init__(self, names: dict[str, int]) -> None:
+        self._names = names
+        self._count = 0
+        self._columns: dict[str, Column] = {}
+        self._subtracks: dict[str, ColumnSet] = {}
+        self._absent: list[int] = []
+
+    def add(self, track: Mapping[str, RowElement | Row]) -> None:
+        """
+        Add the fields of a track to the columns.
+        """
+
+        for field, value in track.items():
+            if isinstance(value, dict):
+                subtrack = self._subtracks.get(field)
+                if subtrack is None:
+                    subtrack = ColumnSet(self._names)
+                    subtrack.skip(self._count)
+                    self._subtracks[field] = subtrack
+                subtrack.add(value)
+                continue
+
+            column = self._columns.get(field)
+            if column is None:
+                column = cast(Column, [None] * self._count)
+                self._columns[field] = column
+            if field in self.ENCODED_FIELDS and isinstance(value, str):
+                value = self._names.setdefault(value, len(self._names))
+            column.append(value)
+
+        self._count += 1
+        self._fill()
+
+    def skip(self, count: int) -> None:
+        """
+        Indicate that a number of tracks do not have this subtrack.
+        """
+
+        self._absent.extend(range(self._count, self._count + count))
+        self._count += count
+        self._fill()
+
+    def _fill(self) -> None:
+        for column in self._columns.values():
+            column.extend([None] * (self._count - len(column)))
+        for subtrack in self._subtracks.values():
+            if subtrack._count < self._count:  # noqa: SLF001
+                subtrack.skip(self._count - subtrack._count)  # noqa: SLF001
+
+    def encode(self) -> ColumnData:
+        """
+        Retrieve the columns in a form that can be serialized.
+        """
+
+        data: ColumnData = {"fields": self._columns}
+        if self._subtracks:
+            data["subtracks"] = {
+                field: subtrack.encode()
+                for field, subtrack in self._subtracks.items()
+            }
+        if self._absent:
+            data["absent"] = self._absent
+        return data
+
+    @classmethod
+    def decode(
+        cls, data: ColumnData, names: list[str], count: int
+    ) -> list[Track | None]:
+        """
+        Convert columns to tracks, with `None` for absent subtracks.
+        """
+
+        tracks: list[Track] = [{} for _ in range(count)]
+        for field, column in data.get("fields", {}).items():
+            encoded = field in cls.ENCODED_FIELDS
+            for track, value in zip(tracks, column, strict=True):
+                if value is None:
+                    continue
+                if encoded and isinstance(value, int):
+                    value = names[value]
+                track[field] = value
+
+        for field, subtrack_data in data.get("subtracks", {}).items():
+            subtracks = cls.decode(subtrack_data, names, count)
+            for track, subtrack in zip(tracks, subtracks, strict=True):
+                if subtrack is not None:
+                    track[field] = cast(Row, subtrack)
+
+        absent = set(data.get("absent", []))
+        return [
+            None if index in absent else track
+            for index, track in enumerate(tracks)
+        ]
+
+
+@Format.register("columnar")
+class Columnar(JSON):
+    """
+    JSON file with the same details as the JSON dump, where the fields of
+    tracks are stored as columns of values, the positions of tracks in earlier
+    years as a matrix of years by tracks and artist names only once.
+    """
+
+    version: ClassVar[int] = 1
+    NOT_CHARTED: ClassVar[int] = 0
+
+    @override
+    def output_file(
+        self,
+        readers: list[ReaderBase],
+        output_format: str,
+        path: Path | None = None,
+        old_data_available: bool = False,
+    ) -> bool:
+        if not readers:
+            return False
+        if path is None:
+            path = self._generate_path(output_format).with_suffix(
+                ".columnar.json"
+            )
+
+        reverse = self._get_bool_setting(output_format, "reverse")
+        relevant = self._get_bool_setting(output_format, "relevant")
+
+        names: dict[str, int] = {}
+        columns = ColumnSet(names)
+        history: dict[str, list[int]] = {
+            year: [] for year in self._get_history_fields()
+        }
+        positions: list[int] = []
+        track_keys: list[list[Key]] = []
+        for track, position, keys in self._aggregate_tracks(
+            readers, output_format, reverse, relevant
+        ):
+            for year, year_positions in history.items():
+                year_position = track.pop(year, None)
+                year_positions.append(
+                    year_position
+                    if isinstance(year_position, int)
+                    else self.NOT_CHARTED
+                )
+            columns.add(track)
+            if position is not None:
+                positions.append(position)
+            track_keys.append(keys)
+
+        history = {
+            year: year_positions
+            for year, year_positions in history.items()
+            if any(year_positions)
+        }
+        data: dict[str, object] = {
+            "version": self.version,
+            "count": len(track_keys),
+            "artist_names": list(names),
+            "tracks": columns.encode(),
+            "history": HistoryData(
+                years=list(history), positions=list(history.values())
+            ),
+            "positions": positions,
+            "keys": track_keys,
+            "artists": self._select_artists(readers, track_keys, relevant),
+        }
+        data.update(
+            self._select_header(output_format, reverse, old_data_available)
+        )
+        data.update(self._select_extra_data(readers))
+        with self._open_output(path) as json_file:
+            json.dump(data, json_file, separators=(",", ":"))
+
+        return True
+
+    @classmethod
+    def load(cls, path: Path) -> Dump:
+        """
+        Read a columnar JSON file and convert it to the JSON dump structure.
+        """
+
+        with path.open("r", encoding="utf-8") as json_file:
+            data = cast(dict[str, object], json.load(json_file))
+
+        if data.pop("version", None) != cls.version:
+            raise ValueError(f"Unsupported columnar JSON file version: {path}")
+        count = cast(int, data.pop("count"))
+        names = cast(list[str], data.pop("artist_names"))
+        tracks = [
+            {} if track is None else track
+            for track in ColumnSet.decode(
+                cast(ColumnData, data.pop("tracks")), names, count
+            )
+        ]
+        history = cast(HistoryData, data.pop("history"))
+        for year, year_positions in zip(
+            history["years"], history["positions"], strict=True
+        ):
+            for track, position in zip(tracks, year_positions, strict=True):
+                if position != cls.NOT_CHARTED:
+                    track[year] = position
+
+        data["tracks"] = tracks
+        return cast(Dump, cast(object, data))
@@ -4,7 +4,7 @@ CSV chart output.
 
 import csv
 import logging
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 from pathlib import Path
 from typing import Required
@@ -17,11 +17,13 @@ from ..readers.base import (
     Base as ReaderBase,
     Key,
     Positions,
-    Row as Track,
-    Tracks,
+    RowElement,
+    TrackView,
 )
 from .base import Format
 
+Track = Mapping[str, RowElement]
+
 
 class Check(TypedDict, total=False):
     """
@@ -73,7 +75,7 @@ class CSV(Format):
         )
         self.reset()
         data = readers[0]
-        with path.open("w", encoding="utf-8") as output:
+        with self._open_output(path) as output:
             writer = csv.writer(output)
             writer.writerow(header)
             for position, keys in self._sort_positions(data.positions, reverse):
@@ -113,7 +115,7 @@ class CSV(Format):
         self,
         position: int,
         keys: Sequence[Key],
-        tracks: Tracks,
+        tracks: TrackView,
         artists: Artists,
     ) -> dict[str, str]:
         key = keys[0]
@@ -163,15 +165,19 @@ class CSV(Format):
 
         return "\u2234"  # therefore sign
 
-    @staticmethod
     def _format_artist_chart(
-        position: int, max_artist_key: str | None, artists: Artists
+        self, position: int, max_artist_key: str | None, artists: Artists
     ) -> str:
         if max_artist_key in artists:
-            artist_tracks = artists[max_artist_key]
-            LOGGER.debug("%s: %r", max_artist_key, artist_tracks)
-            artist_pos = artist_tracks.index(position) + 1
-            return f" {artist_pos}/{len(artist_tracks)}"
+            LOGGER.debug("%s: %r", max_artist_key, artists[max_artist_key])
+            rank = self._cache.rank_artist_chart(
+                position, max_artist_key, artists
+            )
+            if rank is None:
+                raise ValueError(
+                    f"{position} is not in chart of artist {max_artist_key}"
+                )
+            return f" {rank[0] + 1}/{rank[1]}"
         return ""
 
     def _format_timestamp(
@@ -207,7 +213,7 @@ class CSV(Format):
         self,
         keys: list[Key],
         cells: dict[str, str],
-        tracks: Tracks,
+        tracks: TrackView,
         artists: Artists,
     ) -> None:
         """
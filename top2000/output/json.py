@@ -3,9 +3,10 @@ JSON dump output.
 """
 
 import json
+from collections.abc import Iterator
 from itertools import zip_longest
 from pathlib import Path
-from typing import Required
+from typing import Required, TextIO, final
 
 from typing_extensions import TypedDict, override
 
@@ -19,7 +20,7 @@ from ..readers.base import (
     Row,
     RowElement,
 )
-from .base import Format, KeyPair
+from .base import ChartCache, Format, KeyPair
 
 FieldMap = dict[str, str]
 
@@ -43,6 +44,72 @@ class Dump(TypedDict, total=False):
     columns: Required[FieldMap]
 
 
+@final
+class DumpWriter:
+    """
+    Writer of a JSON object which emits fields and elements of array fields
+    as soon as they are provided, in the same minified form as `json.dump`
+    with compact separators.
+    """
+
+    def __init__(self, output: TextIO) -> None:
+        self._output = output
+        self._encoder = json.JSONEncoder(separators=(",", ":"))
+        self._first_field = True
+        self._first_element: bool | None = None
+
+    def _write_key(self, key: str) -> None:
+        assert self._first_element is None, "Array field is still open"
+        separator = "{" if self._first_field else ","
+        _ = self._output.write(f"{separator}{self._encoder.encode(key)}:")
+        self._first_field = False
+
+    def write_field(self, key: str, value: object) -> None:
+        """
+        Write a field with a value.
+        """
+
+        self._write_key(key)
+        _ = self._output.write(self._encoder.encode(value))
+
+    def start_array(self, key: str) -> None:
+        """
+        Write the start of a field with an array value.
+        """
+
+        self._write_key(key)
+        _ = self._output.write("[")
+        self._first_element = True
+
+    def write_element(self, value: object) -> None:
+        """
+        Write an element of the array field that was started.
+        """
+
+        assert self._first_element is not None, "No array field is open"
+        if not self._first_element:
+            _ = self._output.write(",")
+        _ = self._output.write(self._encoder.encode(value))
+        self._first_element = False
+
+    def end_array(self) -> None:
+        """
+        Write the end of the array field that was started.
+        """
+
+        assert self._first_element is not None, "No array field is open"
+        _ = self._output.write("]")
+        self._first_element = None
+
+    def close(self) -> None:
+        """
+        Write the end of the object.
+        """
+
+        assert self._first_element is None, "Array field is still open"
+        _ = self._output.write("{}" if self._first_field else "}")
+
+
 @Format.register("json")
 class JSON(Format):
     """
@@ -51,6 +118,15 @@ class JSON(Format):
 
     _last_position: int | None = None
 
+    @override
+    def select_year(
+        self, current_year: float, cache: ChartCache | None = None
+    ) -> None:
+        super().select_year(current_year, cache=cache)
+        self._fields: dict[
+            tuple[tuple[str | None, ...], str], tuple[list[FieldMap], set[str]]
+        ] = {}
+
     @override
     def output_file(
         self,
@@ -66,17 +142,66 @@ class JSON(Format):
 
         reverse = self._get_bool_setting(output_format, "reverse")
         relevant = self._get_bool_setting(output_format, "relevant")
-        self.reset()
-
-        self._sort_readers(readers)
 
+        # Tracks are written as they are aggregated, positions and keys are
+        # smaller and kept until the tracks are written
         track_keys: list[list[Key]] = []
-        tracks: list[Track] = []
         positions: list[int] = []
+        with self._open_output(path) as json_file:
+            writer = DumpWriter(json_file)
+            writer.start_array("tracks")
+            for track, position, keys in self._aggregate_tracks(
+                readers, output_format, reverse, relevant
+            ):
+                writer.write_element(track)
+                if position is not None:
+                    positions.append(position)
+                track_keys.append(keys)
+            writer.end_array()
+
+            writer.start_array("positions")
+            for position in positions:
+                writer.write_element(position)
+            writer.end_array()
+
+            writer.start_array("keys")
+            for keys in track_keys:
+                writer.write_element(keys)
+            writer.end_array()
+
+            writer.write_field(
+                "artists",
+                self._select_artists(readers, track_keys, relevant),
+            )
+            for key, header in self._select_header(
+                output_format, reverse, old_data_available
+            ).items():
+                writer.write_field(key, header)
+            for key, value in self._select_extra_data(readers).items():
+                writer.write_field(key, value)
+            writer.close()
+
+        return True
+
+    def _aggregate_tracks(
+        self,
+        readers: list[ReaderBase],
+        output_format: str,
+        reverse: bool = False,
+        relevant: bool = False,
+    ) -> Iterator[tuple[Track, int | None, list[Key]]]:
+        """
+        Aggregate tracks from the readers in position order. Each track is
+        provided along with its position in the primary reader, if any, and
+        its selected keys.
+        """
+
+        self.reset()
+        self._sort_readers(readers)
+
         reader_fields, numeric_fields = self._build_fields(
             readers, output_format
         )
-
         for reader_keys in zip_longest(
             *(
                 self._sort_positions(reader.positions, reverse)
@@ -84,21 +209,20 @@ class JSON(Format):
             )
         ):
             self._check_positions(reader_keys, reverse)
-            tracks.append(
-                self._aggregate_track(
-                    readers, reader_keys, reader_fields, numeric_fields
-                )
+            track = self._aggregate_track(
+                readers, reader_keys, reader_fields, numeric_fields
+            )
+            position = reader_keys[0][0] if reader_keys[0] is not None else None
+            yield (
+                track,
+                position,
+                self._select_keys(readers, reader_keys, relevant),
             )
-            if reader_keys[0] is not None:
-                positions.append(reader_keys[0][0])
-
-            track_keys.append(self._select_keys(readers, reader_keys, relevant))
 
-        data: Dump = {
-            "tracks": tracks,
-            "positions": positions,
-            "keys": track_keys,
-            "artists": self._select_artists(readers, track_keys, relevant),
+    def _select_header(
+        self, output_format: str, reverse: bool, old_data_available: bool
+    ) -> dict[str, int | bool | FieldMap]:
+        return {
             "first_year": self._first_year,
             "year": self._current_year,
             "latest_year": self._latest_year,
@@ -106,13 +230,6 @@ class JSON(Format):
             "reverse": reverse,
             "columns": self._get_dict_setting(output_format, "columns"),
         }
-        for key, value in self._select_extra_data(readers).items():
-            data[key] = value  # type: ignore[literal-required]
-
-        with path.open("w", encoding="utf-8") as json_file:
-            json.dump(data, json_file, separators=(",", ":"))
-
-        return True
 
     def _generate_path(self, output_format: str) -> Path:
         name = (
@@ -170,6 +287,10 @@ class JSON(Format):
         reader_formats = [reader.input_format for reader in readers]
         if len(reader_formats) == 0:
             reader_formats.append(None)
+        cache_key = (tuple(reader_formats), output_format)
+        if cache_key in self._fields:
+            return self._fields[cache_key]
+
         reader_fields = [
             {
                 self._format_original_field(original): translate
@@ -182,16 +303,20 @@ class JSON(Format):
             }
             for index, reader_format in enumerate(reader_formats)
         ]
-        years = {
-            str(year): str(year)
-            for year in range(self._first_year, self._latest_year + 1)
-            if year != self._current_year
-        }
-        reader_fields[0].update(years)
+        years = self._get_history_fields()
+        reader_fields[0].update({year: year for year in years})
         numeric_fields = {"year"}
-        numeric_fields.update(years.keys())
+        numeric_fields.update(years)
+        self._fields[cache_key] = (reader_fields, numeric_fields)
         return reader_fields, numeric_fields
 
+    def _get_history_fields(self) -> list[str]:
+        return [
+            str(year)
+            for year in range(self._first_year, self._latest_year + 1)
+            if year != self._current_year
+        ]
+
     def _aggregate_track(
         self,
         readers: list[ReaderBase],
@@ -231,12 +356,10 @@ class JSON(Format):
         numeric_fields: set[str],
     ) -> Row:
         track = reader.tracks[keys[0]]
-        LOGGER.track(
-            str(track.get("title_link")),
-            "Master Blaster (Jammin')",
-            track,
-            fields,
-        )
+        if LOGGER.tracing:
+            LOGGER.track(
+                "title link", str(track.get("title_link")), track, fields
+            )
         track = {
             field: track[key] for key, field in fields.items() if key in track
         }
@@ -267,9 +390,9 @@ class JSON(Format):
                     relevant_keys, key_pair[0], key_pair[1], primary=readers[0]
                 )
             primary = False
-        if relevant_keys:
+        if relevant_keys and LOGGER.tracing:
             LOGGER.track(
-                "bob marley",
+                "relevant keys",
                 next(iter(relevant_keys.values()))[0],
                 reader_keys,
                 relevant_keys,
@@ -0,0 +1,381 @@
+"""
+Manifest of content hashes of output files.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import sys
+from collections.abc import Callable, Collection, Generator, Iterable
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import ClassVar, TextIO, cast, final
+
+from typing_extensions import Buffer, TypedDict, override
+
+from ..logging import LOGGER
+
+Compressor = Callable[["HashedFile"], io.BufferedIOBase]
+
+COMPRESSION_SUFFIXES = ("gz", "zst")
+
+COMPRESSORS: dict[str, Compressor] = {
+    # Without a file name and modification time in the header, identical
+    # contents are always compressed to the same bytes
+    "gz": lambda output: gzip.GzipFile(
+        filename="", mode="wb", compresslevel=9, fileobj=output, mtime=0
+    ),
+}
+if sys.version_info >= (3, 14):
+    from compression import zstd  # pyright: ignore[reportUnreachable]
+
+    COMPRESSORS["zst"] = lambda output: zstd.ZstdFile(output, "w", level=19)
+
+
+class Entry(TypedDict):
+    """
+    Content hash of an output file, as well as the size and modification time
+    of the file when it was written.
+    """
+
+    sha256: str
+    size: int
+    mtime_ns: int
+
+
+class Build(TypedDict):
+    """
+    Digests of the inputs and the settings with which an output was built, as
+    well as the output files that were written for it.
+    """
+
+    inputs: str
+    settings: str
+    files: list[str]
+
+
+class Changes(TypedDict):
+    """
+    Entries of output files and builds of outputs that were written or
+    removed, where removed ones have an entry of `None`.
+    """
+
+    files: dict[str, Entry | None]
+    builds: dict[str, Build | None]
+
+
+@final
+class HashedFile(io.RawIOBase):
+    """
+    Binary file which computes the content hash of the written contents.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self._output = path.open("wb")
+        self._hash = hashlib.sha256()
+
+    @property
+    def digest(self) -> str:
+        """
+        Retrieve the content hash of the contents written so far.
+        """
+
+        return self._hash.hexdigest()
+
+    @override
+    def writable(self) -> bool:
+        return True
+
+    @override
+    def write(self, buffer: Buffer, /) -> int:
+        self._hash.update(buffer)
+        return self._output.write(buffer)
+
+    @override
+    def close(self) -> None:
+        self._output.close()
+        super().close()
+
+
+@final
+class TeeFile(io.RawIOBase):
+    """
+    Binary file which writes the contents to multiple binary files.
+    """
+
+    def __init__(self, outputs: list[io.BufferedIOBase | HashedFile]) -> None:
+        super().__init__()
+        self._outputs = outputs
+
+    @override
+    def writable(self) -> bool:
+        return True
+
+    @override
+    def write(self, buffer: Buffer, /) -> int:
+        for output in self._outputs:
+            _ = output.write(buffer)
+        return memoryview(buffer).nbytes
+
+
+@final
+class Manifest:
+    """
+    Record of output files and hashes of their contents. Output files are
+    written to a temporary file first, which only replaces the output file if
+    the contents changed since the output file was last written. Unchanged
+    output files therefore keep their modification time. The manifest also
+    records the digests of the inputs and settings of each built output, so
+    that an output does not need to be formatted again while they and its
+    files are unchanged. In worker processes, changes may be collected
+    instead of stored, so that the main process can merge them into its
+    manifest. The manifest file is only written when it is saved.
+    """
+
+    version: ClassVar[int] = 2
+    default_path: ClassVar[str] = ".top2000-manifest.json"
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = Path(self.default_path) if path is None else path
+        self._entries: dict[str, Entry] = {}
+        self._builds: dict[str, Build] = {}
+        self._build_files: list[str] | None = None
+        self._changes: Changes | None = None
+        self._dirty = False
+        try:
+            with self._path.open("r", encoding="utf-8") as manifest_file:
+                manifest = cast(dict[str, object], json.load(manifest_file))
+        except (OSError, ValueError):
+            return
+
+        if manifest.get("version") == self.version:
+            self._entries = cast(dict[str, Entry], manifest.get("files", {}))
+            self._builds = cast(dict[str, Build], manifest.get("builds", {}))
+
+    def _is_unchanged(self, path: Path, digest: str) -> bool:
+        entry = self._entries.get(str(path))
+        if entry is None or entry["sha256"] != digest:
+            return False
+
+        # Check that the file was not altered after it was last written
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return (
+            stat.st_size == entry["size"]
+            and stat.st_mtime_ns == entry["mtime_ns"]
+        )
+
+    @contextmanager
+    def open(
+        self, path: Path, compression: Collection[str] = ()
+    ) -> Generator[TextIO]:
+        """
+        Open an output file for writing within the context. The file is only
+        replaced once the context ends if its contents changed. For each of
+        the `compression` suffixes, a compressed copy of the file is written
+        at the same time, which is replaced in the same way.
+        """
+
+        paths = [path]
+        paths.extend(
+            path.with_name(f"{path.name}.{suffix}") for suffix in compression
+        )
+        if self._build_files is not None:
+            self._build_files.extend(str(output_path) for output_path in paths)
+        temp_paths = [
+            output_path.with_name(f"{output_path.name}.tmp")
+            for output_path in paths
+        ]
+        try:
+            with ExitStack() as stack:
+                files = [
+                    stack.enter_context(HashedFile(temp_path))
+                    for temp_path in temp_paths
+                ]
+                outputs: list[io.BufferedIOBase | HashedFile] = [files[0]]
+                outputs.extend(
+                    stack.enter_context(COMPRESSORS[suffix](compressed_file))
+                    for suffix, compressed_file in zip(
+                        compression, files[1:], strict=True
+                    )
+                )
+                with io.TextIOWrapper(
+                    io.BufferedWriter(TeeFile(outputs)), encoding="utf-8"
+                ) as output:
+                    yield output
+
+            for output_path, temp_path, hashed_file in zip(
+                paths, temp_paths, files, strict=True
+            ):
+                self._replace(output_path, temp_path, hashed_file.digest)
+        except BaseException:
+            for temp_path in temp_paths:
+                temp_path.unlink(missing_ok=True)
+            raise
+
+        # Remove compressed copies that are no longer written
+        self._remove_entries(
+            path.with_name(f"{path.name}.{suffix}")
+            for suffix in COMPRESSION_SUFFIXES
+            if suffix not in compression
+        )
+
+    def _replace(self, path: Path, temp_path: Path, digest: str) -> None:
+        if self._is_unchanged(path, digest):
+            LOGGER.info("Output file %s is unchanged", path)
+            temp_path.unlink()
+            return
+
+        _ = temp_path.replace(path)
+        stat = path.stat()
+        self._update(
+            str(path),
+            {
+                "sha256": digest,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            },
+        )
+
+    def _update(self, name: str, entry: Entry | None) -> None:
+        if entry is None:
+            _ = self._entries.pop(name, None)
+        else:
+            self._entries[name] = entry
+        self._dirty = True
+        if self._changes is not None:
+            self._changes["files"][name] = entry
+
+    def _update_build(self, name: str, build: Build | None) -> None:
+        if build is None:
+            if self._builds.pop(name, None) is None:
+                return
+        else:
+            self._builds[name] = build
+        self._dirty = True
+        if self._changes is not None:
+            self._changes["builds"][name] = build
+
+    def _remove_entries(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            if str(path) in self._entries:
+                path.unlink(missing_ok=True)
+                self._update(str(path), None)
+
+    def is_built(self, name: str, inputs: str, settings: str) -> bool:
+        """
+        Check whether an output was built before with the same digests of
+        inputs and settings and its output files are unchanged since then.
+        """
+
+        build = self._builds.get(name)
+        if build is None or (build["inputs"], build["settings"]) != (
+            inputs,
+            settings,
+        ):
+            return False
+
+        return all(
+            (entry := self._entries.get(file_name)) is not None
+            and self._is_unchanged(Path(file_name), entry["sha256"])
+            for file_name in build["files"]
+        )
+
+    @contextmanager
+    def build(self, name: str, inputs: str, settings: str) -> Generator[None]:
+        """
+        Record the output files that are written within the context as the
+        build of an output with digests of its inputs and settings. If the
+        context ends with an error, then the build is forgotten.
+        """
+
+        files: list[str] = []
+        self._build_files = files
+        try:
+            yield
+        except BaseException:
+            self._update_build(name, None)
+            raise
+        finally:
+            self._build_files = None
+
+        self._update_build(
+            name,
+            {
+                "inputs": inputs,
+                "settings": settings,
+                "files": sorted(set(files)),
+            },
+        )
+
+    def forget(self, name: str) -> None:
+        """
+        Remove the build of an output, such that it is formatted again later.
+        """
+
+        self._update_build(name, None)
+
+    def remove(self, path: Path) -> None:
+        """
+        Remove an output file as well as compressed copies of it that were
+        written before.
+        """
+
+        path.unlink(missing_ok=True)
+        self._update(str(path), None)
+        self._remove_entries(
+            path.with_name(f"{path.name}.{suffix}")
+            for suffix in COMPRESSION_SUFFIXES
+        )
+
+    def collect_changes(self) -> Changes:
+        """
+        Retrieve the entries of output files and builds that were written or
+        removed since the changes were last collected. From now on, changes
+        are no longer stored in the manifest file until they are merged into
+        a manifest.
+        """
+
+        changes: Changes = (
+            {"files": {}, "builds": {}}
+            if self._changes is None
+            else self._changes
+        )
+        self._changes = {"files": {}, "builds": {}}
+        return changes
+
+    def merge(self, changes: Changes) -> None:
+        """
+        Update the manifest with changes collected from another manifest.
+        """
+
+        for name, entry in changes["files"].items():
+            self._update(name, entry)
+        for name, build in changes["builds"].items():
+            self._update_build(name, build)
+
+    def save(self) -> None:
+        """
+        Store the content hashes of the output files and the builds in the
+        manifest file if they changed since the manifest was last saved,
+        unless changes are collected instead.
+        """
+
+        if self._changes is not None or not self._dirty:
+            return
+        with self._path.open("w", encoding="utf-8") as manifest_file:
+            json.dump(
+                {
+                    "version": self.version,
+                    "files": self._entries,
+                    "builds": self._builds,
+                },
+                manifest_file,
+                indent=2,
+                sort_keys=True,
+            )
+        self._dirty = False
@@ -0,0 +1,143 @@
+"""
+Sharded JSON dump output.
+"""
+
+import json
+from collections.abc import MutableSequence
+from pathlib import Path
+from typing import ClassVar
+
+from typing_extensions import override
+
+from ..readers.base import Base as ReaderBase, Key
+from .base import Format
+from .json import JSON, Track
+
+Chunk = list[tuple[Track, int | None, list[Key]]]
+History = dict[str, list[int | None]]
+
+
+@Format.register("shards")
+class Shards(JSON):
+    """
+    Directory of JSON files with the same details as the JSON dump, split into
+    a manifest, chunks of tracks in position order, an index of artist charts,
+    positions of the tracks in each earlier year and other data of readers
+    which are each loaded when needed.
+    """
+
+    version: ClassVar[int] = 1
+
+    @override
+    def reset(self) -> None:
+        super().reset()
+        self._written: set[str] = set()
+
+    @override
+    def output_file(
+        self,
+        readers: list[ReaderBase],
+        output_format: str,
+        path: Path | None = None,
+        old_data_available: bool = False,
+    ) -> bool:
+        if not readers:
+            return False
+        if path is None:
+            path = self._generate_path(output_format).with_suffix("")
+
+        reverse = self._get_bool_setting(output_format, "reverse")
+        relevant = self._get_bool_setting(output_format, "relevant")
+        chunk_size = self._get_int_setting(output_format, "chunk_size", 100)
+        assert chunk_size > 0, "chunk_size must be positive"
+
+        path.mkdir(parents=True, exist_ok=True)
+        history: History = {year: [] for year in self._get_history_fields()}
+        track_keys: list[list[Key]] = []
+        chunk: Chunk = []
+        chunks: list[str] = []
+        for track, position, keys in self._aggregate_tracks(
+            readers, output_format, reverse, relevant
+        ):
+            for year, positions in history.items():
+                year_position = track.pop(year, None)
+                positions.append(
+                    year_position if isinstance(year_position, int) else None
+                )
+            track_keys.append(keys)
+            chunk.append((track, position, keys))
+            if len(chunk) == chunk_size:
+                chunks.append(self._write_chunk(path, len(chunks), chunk))
+                chunk = []
+        if chunk:
+            chunks.append(self._write_chunk(path, len(chunks), chunk))
+
+        manifest: dict[str, object] = {
+            "version": self.version,
+            "count": len(track_keys),
+            "chunk_size": chunk_size,
+            "chunks": chunks,
+            "history": self._write_history(path, history),
+            "artists": self._write_shard(
+                path,
+                "artists",
+                self._select_artists(readers, track_keys, relevant),
+            ),
+        }
+        manifest.update(
+            self._select_header(output_format, reverse, old_data_available)
+        )
+        manifest["extra"] = self._write_extra_data(path, readers, manifest)
+        _ = self._write_shard(path, "manifest", manifest)
+
+        # Remove shards of earlier outputs with more chunks or other years
+        for outdated in path.glob("*.json"):
+            if outdated.name not in self._written:
+                self._remove_output(outdated)
+
+        return True
+
+    def _write_shard(self, path: Path, name: str, value: object) -> str:
+        filename = f"{name}.json"
+        with self._open_output(path / filename) as shard_file:
+            json.dump(value, shard_file, separators=(",", ":"))
+        self._written.add(filename)
+        return filename
+
+    def _write_chunk(self, path: Path, index: int, chunk: Chunk) -> str:
+        return self._write_shard(
+            path,
+            f"tracks-{index}",
+            {
+                "tracks": [track for track, _, _ in chunk],
+                "positions": [
+                    position for _, position, _ in chunk if position is not None
+                ],
+                "keys": [keys for _, _, keys in chunk],
+            },
+        )
+
+    def _write_history(self, path: Path, history: History) -> dict[str, str]:
+        return {
+            year: self._write_shard(
+                path, f"history-{year}", {"positions": positions}
+            )
+            for year, positions in history.items()
+            if any(position is not None for position in positions)
+        }
+
+    def _write_extra_data(
+        self,
+        path: Path,
+        readers: list[ReaderBase],
+        manifest: dict[str, object],
+    ) -> dict[str, str]:
+        extra: dict[str, str] = {}
+        for key, value in self._select_extra_data(readers).items():
+            # Data of readers per position is only needed for details of
+            # a track, the credits are small enough to keep in the manifest
+            if key != "credits" and isinstance(value, MutableSequence):
+                extra[key] = self._write_shard(path, f"extra-{key}", value)
+            else:
+                manifest[key] = value
+        return extra
@@ -0,0 +1,126 @@
+"""
+Profiling of parsing phases and counters of parsing events.
+"""
+
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import final
+
+from typing_extensions import TypedDict
+
+from .normalization import Normalizer
+
+
+class Timing(TypedDict):
+    """
+    Accumulated wall and CPU time in seconds of calls to a phase.
+    """
+
+    wall: float
+    cpu: float
+    calls: int
+
+
+class Report(TypedDict):
+    """
+    Profiling results of phases and counters by year, as well as counters of
+    memoized normalization results.
+    """
+
+    phases: dict[str, dict[str, Timing]]
+    counters: dict[str, dict[str, int]]
+    normalizer: dict[str, dict[str, int]]
+
+
+@final
+class Profiler:
+    """
+    Recorder of wall and CPU time of parsing phases and of counters of events
+    during parsing, for each year. Nothing is recorded unless the profiler is
+    enabled. Time of phases which are nested in other phases is also included
+    in the time of the outer phase.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self._phases: dict[str, dict[str, Timing]] = {}
+        self._counters: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def _format_year(year: float | None) -> str:
+        return "all" if year is None else f"{year:g}"
+
+    @contextmanager
+    def phase(self, name: str, year: float | None = None) -> Generator[None]:
+        """
+        Record the wall and CPU time of a phase for a year within the context.
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            timing = self._phases.setdefault(name, {}).setdefault(
+                self._format_year(year), {"wall": 0.0, "cpu": 0.0, "calls": 0}
+            )
+            timing["wall"] += time.perf_counter() - wall
+            timing["cpu"] += time.process_time() - cpu
+            timing["calls"] += 1
+
+    def merge(self, phases: dict[str, dict[str, Timing]]) -> None:
+        """
+        Add phase timings recorded by another profiler, such as one in
+        a worker process.
+        """
+
+        if not self.enabled:
+            return
+
+        for name, years in phases.items():
+            for year, other in years.items():
+                timing = self._phases.setdefault(name, {}).setdefault(
+                    year, {"wall": 0.0, "cpu": 0.0, "calls": 0}
+                )
+                timing["wall"] += other["wall"]
+                timing["cpu"] += other["cpu"]
+                timing["calls"] += other["calls"]
+
+    def count(
+        self, name: str, year: float | None = None, amount: int = 1
+    ) -> None:
+        """
+        Increase a counter of events for a year.
+        """
+
+        if self.enabled:
+            counters = self._counters.setdefault(name, {})
+            key = self._format_year(year)
+            counters[key] = counters.get(key, 0) + amount
+
+    def report(self) -> Report:
+        """
+        Retrieve the recorded phase timings and counters.
+        """
+
+        return {
+            "phases": self._phases,
+            "counters": self._counters,
+            "normalizer": Normalizer.get_instance().cache_stats,
+        }
+
+    def reset(self) -> None:
+        """
+        Remove recorded phase timings and counters.
+        """
+
+        self._phases = {}
+        self._counters = {}
+
+
+PROFILER = Profiler()
@@ -2,19 +2,38 @@
 Base row-based data parser.
 """
 
-import bisect
+import hashlib
+import sys
 import tomllib
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Iterator, MutableMapping, MutableSequence
+from array import array
+from collections.abc import (
+    Callable,
+    Container,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+)
 from copy import deepcopy
 from itertools import chain, product
 from pathlib import Path
-from typing import ClassVar, Literal, TypeVar, overload
+from typing import (
+    ClassVar,
+    Literal,
+    NamedTuple,
+    TypeVar,
+    cast,
+    final,
+    overload,
+)
 
 from typing_extensions import override
 
 from ..logging import LOGGER
 from ..normalization import Normalizer
+from ..profiling import PROFILER
 
 BaseT = TypeVar("BaseT", bound=type["Base"])
 
@@ -25,32 +44,119 @@ RelevantKeys = dict[tuple[int, ...], Key]
 Positions = dict[int, list[Key]]
 RowElement = str | int | bool
 Row = dict[str, RowElement]
-Tracks = dict[Key, Row]
+Tracks = MutableMapping[Key, Row]
+TrackView = Mapping[Key, Mapping[str, RowElement]]
 Artists = dict[str, list[int]]
+NormalizedNames = tuple[
+    dict[str, str], dict[str, list[str]], dict[str, list[str]]
+]
+PreparedFile = tuple[list[Row], NormalizedNames]
 
 ExtraPositions = MutableSequence[Row]
 ExtraData = RowElement | ExtraPositions
 
 Field = int | float | str | bool | RowPath
 Fields = MutableMapping[str, Field | MutableMapping[str, Field]]
+FieldTable = dict[str, Field]
 FieldMap = dict[str, str]
 
 
+Settings = dict[str, list[Fields] | MutableMapping[str, Field]]
+ViewKey = tuple[float, str | None]
+
+
+class FieldView(NamedTuple):
+    """
+    Resolved field settings of a year and input format, with the fields
+    grouped by their type so that they can be retrieved without checks.
+    """
+
+    keys: frozenset[str]
+    strings: Mapping[str, str]
+    numbers: Mapping[str, int | float]
+    bools: Mapping[str, bool]
+    paths: Mapping[str, RowPath]
+    tables: Mapping[str, list[FieldTable]]
+
+    @classmethod
+    def resolve(cls, fields: Fields, input_format: str | None) -> "FieldView":
+        """
+        Resolve the fields of an input format from the fields of a year.
+        """
+
+        if input_format is not None:
+            format_fields = fields.get(input_format, {})
+            assert isinstance(format_fields, dict), (
+                f"{input_format} must be a dict"
+            )
+            fields = cast(Fields, format_fields)
+
+        strings: dict[str, str] = {}
+        numbers: dict[str, int | float] = {}
+        bools: dict[str, bool] = {}
+        paths: dict[str, RowPath] = {}
+        tables: dict[str, list[FieldTable]] = {}
+        for key, field in fields.items():
+            if isinstance(field, str):
+                strings[key] = field
+            elif isinstance(field, (int, float)):
+                numbers[key] = field
+                if isinstance(field, bool):
+                    bools[key] = field
+            elif isinstance(field, list):
+                items = cast(list[object], field)
+                if all(isinstance(item, dict) for item in items):
+                    tables[key] = cast(list[FieldTable], field)
+                if not any(isinstance(item, dict) for item in items):
+                    paths[key] = field
+
+        return cls(frozenset(fields), strings, numbers, bools, paths, tables)
+
+
+@final
 class FieldHolder(MutableMapping[float, Fields]):
     """
     Field-based settings for reading input files of different years and formats.
+
+    The settings file is parsed once per process for as long as it does not
+    change. Field holders share the settings of years and their resolved views
+    until a year is changed in a field holder, which then uses its own copy.
     """
 
+    _loaded: ClassVar[
+        dict[Path, tuple[tuple[int, int], Settings, dict[float, Fields], str]]
+    ] = {}
+    _shared_views: ClassVar[dict[tuple[Path, ViewKey], FieldView]] = {}
+
     def __init__(self) -> None:
-        with Path("fields.toml").open("rb") as fields_file:
-            self._raw: dict[str, list[Fields] | MutableMapping[str, Field]] = (
-                tomllib.load(fields_file)
-            )
-            self._fields: MutableMapping[float, Fields] = {}
-            if isinstance(self._raw["years"], list):
-                for year in self._raw["years"]:
+        path = Path("fields.toml").resolve()
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        loaded = self._loaded.get(path)
+        if loaded is None or loaded[0] != signature:
+            contents = path.read_bytes()
+            raw: Settings = tomllib.loads(contents.decode("utf-8"))
+            years: dict[float, Fields] = {}
+            if isinstance(raw["years"], list):
+                for year in raw["years"]:
                     if isinstance(year["year"], (int, float)):
-                        self._fields[year["year"]] = deepcopy(year)
+                        years[year["year"]] = year
+            loaded = (
+                signature,
+                raw,
+                years,
+                hashlib.sha256(contents).hexdigest(),
+            )
+            self._loaded[path] = loaded
+            for key in [key for key in self._shared_views if key[0] == path]:
+                del self._shared_views[key]
+
+        self._path = path
+        self._raw: Settings = loaded[1]
+        self._fields: MutableMapping[float, Fields] = loaded[2].copy()
+        self._digest: str = loaded[3]
+        self._owned: set[float] = set()
+        self._views: dict[ViewKey, FieldView] = {}
 
     @override
     def __getitem__(self, key: float) -> Fields:
@@ -59,10 +165,12 @@ class FieldHolder(MutableMapping[float, Fields]):
     @override
     def __setitem__(self, key: float, value: Fields) -> None:
         self._fields[key] = deepcopy(value)
+        self._invalidate(key)
 
     @override
     def __delitem__(self, key: float) -> None:
         del self._fields[key]
+        self._invalidate(key)
 
     @override
     def __iter__(self) -> Iterator[float]:
@@ -72,13 +180,29 @@ class FieldHolder(MutableMapping[float, Fields]):
     def __len__(self) -> int:
         return len(self._fields)
 
+    @property
+    def digest(self) -> str:
+        """
+        Retrieve a hash of the field settings file contents.
+        """
+
+        return self._digest
+
+    def _invalidate(self, year: float) -> None:
+        self._owned.add(year)
+        for key in [key for key in self._views if key[0] == year]:
+            del self._views[key]
+
     def update_year(self, year: float, fields: Fields | str) -> None:
         """
         Merge fields with existing fields for a year.
         """
 
-        if year not in self._fields:
+        if year not in self._owned:
+            self._fields[year] = deepcopy(self._fields.get(year, {}))
+        elif year not in self._fields:
             self._fields[year] = {}
+        self._invalidate(year)
 
         if isinstance(fields, str):
             subfields = deepcopy(self._raw.get(fields, {}))
@@ -94,6 +218,29 @@ class FieldHolder(MutableMapping[float, Fields]):
 
         self._fields[year].update(fields)
 
+    def get_view(self, year: float, input_format: str | None) -> FieldView:
+        """
+        Get the resolved fields for a year and input format.
+        """
+
+        key = (year, input_format)
+        if (view := self._views.get(key)) is not None:
+            return view
+
+        if year in self._owned:
+            view = FieldView.resolve(self._fields.get(year, {}), input_format)
+        else:
+            shared_key = (self._path, key)
+            view = self._shared_views.get(shared_key)
+            if view is None:
+                view = FieldView.resolve(
+                    self._fields.get(year, {}), input_format
+                )
+                self._shared_views[shared_key] = view
+
+        self._views[key] = view
+        return view
+
     def get_str_field(
         self, year: float, input_format: str | None, key: str, default: str = ""
     ) -> str:
@@ -101,13 +248,10 @@ class FieldHolder(MutableMapping[float, Fields]):
         Get a string field for a year and input format.
         """
 
-        fields = self._fields.get(year, {})
-        if input_format is not None:
-            subfield = fields.get(input_format, {})
-            assert isinstance(subfield, dict), f"{input_format} must be a dict"
-            fields = subfield
-        field = fields.get(key, default)
-        assert isinstance(field, str), f"{key} must be a string"
+        view = self.get_view(year, input_format)
+        if (field := view.strings.get(key)) is None:
+            assert key not in view.keys, f"{key} must be a string"
+            return default
         return field
 
     def get_int_field(
@@ -117,15 +261,29 @@ class FieldHolder(MutableMapping[float, Fields]):
         Get an integer field for a year and input format.
         """
 
-        fields = self._fields.get(year, {})
-        if input_format is not None:
-            format_fields = fields.get(input_format, {})
-            assert isinstance(format_fields, dict)
-            fields = format_fields
-        field = fields.get(key, default)
-        assert isinstance(field, (int, float)), f"{key} must be an int or float"
+        view = self.get_view(year, input_format)
+        if (field := view.numbers.get(key)) is None:
+            assert key not in view.keys, f"{key} must be an int or float"
+            return default
         return int(field)
 
+    def get_float_field(
+        self,
+        year: float,
+        input_format: str | None,
+        key: str,
+        default: float = 0.0,
+    ) -> float:
+        """
+        Get a floating point field for a year and input format.
+        """
+
+        view = self.get_view(year, input_format)
+        if (field := view.numbers.get(key)) is None:
+            assert key not in view.keys, f"{key} must be an int or float"
+            return default
+        return float(field)
+
     def get_bool_field(
         self,
         year: float,
@@ -137,13 +295,10 @@ class FieldHolder(MutableMapping[float, Fields]):
         Get a boolean field for a year and input format.
         """
 
-        fields = self._fields.get(year, {})
-        if input_format is not None:
-            format_fields = fields.get(input_format, {})
-            assert isinstance(format_fields, dict)
-            fields = format_fields
-        field = fields.get(key, default)
-        assert isinstance(field, bool), f"{key} must be a boolean"
+        view = self.get_view(year, input_format)
+        if (field := view.bools.get(key)) is None:
+            assert key not in view.keys, f"{key} must be a boolean"
+            return default
         return field
 
     def get_path_field(
@@ -153,16 +308,372 @@ class FieldHolder(MutableMapping[float, Fields]):
         Get a list field that indicates a nested object path for a year.
         """
 
-        fields = self._fields.get(year, {})
-        if input_format is not None:
-            format_fields = fields.get(input_format, {})
-            assert isinstance(format_fields, dict)
-            fields = format_fields
-        field = fields.get(key, [])
-        assert isinstance(field, list), f"{key} must be a list"
+        view = self.get_view(year, input_format)
+        if (field := view.paths.get(key)) is None:
+            assert key not in view.keys, f"{key} must be a list"
+            return []
+        return field
+
+    def get_table_list_field(
+        self, year: float, input_format: str | None, key: str
+    ) -> list[FieldTable]:
+        """
+        Get a list field with tables of fields for a year and input format.
+        """
+
+        view = self.get_view(year, input_format)
+        if (field := view.tables.get(key)) is None:
+            assert key not in view.keys, f"{key} must be a list of tables"
+            return []
         return field
 
 
+@final
+class TrackRow(Mapping[str, RowElement]):
+    """
+    Read-only view of the fields of a track in a compact table of tracks.
+    Values are looked up in the record of the track when they are retrieved,
+    without building a row. Use `dict(row)` to obtain a row that can be
+    changed, which can then be stored in the table again.
+    """
+
+    __slots__ = ("_index", "_table")
+
+    def __init__(self, table: "TrackTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @override
+    def __getitem__(self, field: str) -> RowElement:
+        return self._table.get_value(self._index, field)
+
+    @override
+    def __contains__(self, field: object) -> bool:
+        return isinstance(field, str) and self._table.has_value(
+            self._index, field
+        )
+
+    @override
+    def __iter__(self) -> Iterator[str]:
+        return self._table.iter_fields(self._index)
+
+    @override
+    def __len__(self) -> int:
+        return sum(1 for _ in self._table.iter_fields(self._index))
+
+    @override
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+@final
+class TrackTable(Mapping[Key, TrackRow]):
+    """
+    Compact read-only table of tracks. Tracks with equal data, such as the
+    tracks of alternative keys, share one record. A record consists of a tuple
+    of interned field names, which is shared with other records that have the
+    same fields, and a tuple of values in the same order. Integer positions
+    and timestamps of each year are stored in typed arrays indexed by record.
+    Retrieving a track returns a read-only view of its record, so rows are not
+    rebuilt for every lookup. Changed tracks must be stored again.
+    """
+
+    _absent: ClassVar[int] = -(2**63)
+
+    def __init__(self, tracks: Mapping[Key, Row]) -> None:
+        self._keys: dict[Key, int] = {}
+        self._schemas: list[tuple[str, ...]] = []
+        self._schema_indexes: dict[tuple[str, ...], int] = {}
+        self._slots: list[dict[str, int]] = []
+        self._records: list[tuple[int, tuple[RowElement, ...]]] = []
+        self._columns: dict[str, array[int]] = {}
+        self.store(tracks)
+
+    def store(self, tracks: Mapping[Key, Row]) -> None:
+        """
+        Add new tracks to the table or replace tracks in it. Records of
+        replaced tracks are left in the table, since they may be shared.
+        """
+
+        records: dict[tuple[object, ...], int] = {}
+        shared: dict[int, int] = {}
+        for key, track in tracks.items():
+            # Alias keys which share a track also share its record
+            if (index := shared.get(id(track))) is not None:
+                self._keys[sys.intern(key[0]), sys.intern(key[1])] = index
+                continue
+
+            fields: list[str] = []
+            values: list[RowElement] = []
+            numbers: list[tuple[str, int]] = []
+            for field, value in track.items():
+                if self._is_column(field, value):
+                    numbers.append((sys.intern(field), int(value)))
+                else:
+                    fields.append(sys.intern(field))
+                    values.append(
+                        sys.intern(value) if isinstance(value, str) else value
+                    )
+
+            schema = self._schema_indexes.setdefault(
+                tuple(fields), len(self._schema_indexes)
+            )
+            if schema == len(self._schemas):
+                self._schemas.append(tuple(fields))
+                self._slots.append(
+                    {field: slot for slot, field in enumerate(fields)}
+                )
+            record = (schema, tuple(values))
+            identity = (
+                *record,
+                tuple(map(type, values)),
+                tuple(numbers),
+            )
+            try:
+                index = records.setdefault(identity, len(self._records))
+            except TypeError:
+                index = len(self._records)
+            if index == len(self._records):
+                self._add_record(record, numbers)
+
+            shared[id(track)] = index
+            self._keys[sys.intern(key[0]), sys.intern(key[1])] = index
+
+    @staticmethod
+    def _is_column(field: str, value: RowElement) -> bool:
+        return (
+            type(value) is int
+            and field[-4:].isnumeric()
+            and TrackTable._absent < value < 2**63
+        )
+
+    def _add_record(
+        self,
+        record: tuple[int, tuple[RowElement, ...]],
+        numbers: list[tuple[str, int]],
+    ) -> None:
+        for field, _ in numbers:
+            if field not in self._columns:
+                self._columns[field] = array(
+                    "q", [self._absent] * len(self._records)
+                )
+        self._records.append(record)
+        for column in self._columns.values():
+            column.append(self._absent)
+        for field, number in numbers:
+            self._columns[field][-1] = number
+
+    @override
+    def __getitem__(self, key: Key) -> TrackRow:
+        return TrackRow(self, self._keys[key])
+
+    def get_value(self, index: int, field: str) -> RowElement:
+        """
+        Retrieve the value of a field of the record at an index.
+        """
+
+        column = self._columns.get(field)
+        if column is not None and (number := column[index]) != self._absent:
+            return number
+        schema, values = self._records[index]
+        if (slot := self._slots[schema].get(field)) is None:
+            raise KeyError(field)
+        return values[slot]
+
+    def has_value(self, index: int, field: str) -> bool:
+        """
+        Check whether the record at an index has a field.
+        """
+
+        column = self._columns.get(field)
+        if column is not None and column[index] != self._absent:
+            return True
+        return field in self._slots[self._records[index][0]]
+
+    def iter_fields(self, index: int) -> Iterator[str]:
+        """
+        Iterate over the fields of the record at an index.
+        """
+
+        yield from self._schemas[self._records[index][0]]
+        for field, column in self._columns.items():
+            if column[index] != self._absent:
+                yield field
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    @override
+    def __iter__(self) -> Iterator[Key]:
+        return iter(self._keys)
+
+    @override
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def fields(self) -> list[str]:
+        """
+        Retrieve the names of all fields that tracks in the table have.
+        """
+
+        fields = dict.fromkeys(chain.from_iterable(self._schemas))
+        fields.update(dict.fromkeys(self._columns))
+        return list(fields)
+
+    def scan(self, field: str) -> Iterator[tuple[Key, RowElement]]:
+        """
+        Iterate over the keys of tracks which have a field, in table order,
+        along with the value of the field for each track.
+        """
+
+        column = self._columns.get(field)
+        slots = [
+            schema.index(field) if field in schema else -1
+            for schema in self._schemas
+        ]
+        for key, index in self._keys.items():
+            if column is not None and (number := column[index]) != self._absent:
+                yield key, number
+                continue
+
+            schema, values = self._records[index]
+            if (slot := slots[schema]) >= 0:
+                yield key, values[slot]
+
+
+@final
+class TrackChanges(MutableMapping[Key, Row]):
+    """
+    Mutable tracks on top of a compact table of tracks. A track from the table
+    is copied into the changes once it is retrieved, so that it can be updated
+    in place. The changes can be stored in the table afterward.
+    """
+
+    def __init__(self, table: TrackTable) -> None:
+        self._table = table
+        self.changes: dict[Key, Row] = {}
+        self._added = 0
+
+    @override
+    def __getitem__(self, key: Key) -> Row:
+        if key not in self.changes:
+            self.changes[key] = dict(self._table[key])
+        return self.changes[key]
+
+    @override
+    def __setitem__(self, key: Key, value: Row) -> None:
+        if key not in self.changes and key not in self._table:
+            self._added += 1
+        self.changes[key] = value
+
+    @override
+    def __delitem__(self, key: Key) -> None:
+        if key in self._table:
+            raise TypeError("Tracks in the table cannot be removed")
+        del self.changes[key]
+        self._added -= 1
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        return key in self.changes or key in self._table
+
+    @override
+    def __iter__(self) -> Iterator[Key]:
+        yield from self._table
+        for key in self.changes:
+            if key not in self._table:
+                yield key
+
+    @override
+    def __len__(self) -> int:
+        return len(self._table) + self._added
+
+
+@final
+class SharedTracks(MutableMapping[Key, Row]):
+    """
+    Tracks where the alias keys of a track share one record for as long as
+    the same data is stored for each of them. Keys which share a record form
+    a group. A key leaves its group when another track is stored for it, or
+    when it receives its own copy of the record before a change which does
+    not apply to the entire group. Records must only be changed in place
+    after they are retrieved through `writable`.
+    """
+
+    def __init__(self) -> None:
+        self._tracks: dict[Key, Row] = {}
+        self._groups: dict[Key, list[Key]] = {}
+
+    def share(self, key: Key, alias: Key) -> None:
+        """
+        Store the record of an existing alias key for a new key as well.
+        """
+
+        group = self._groups.get(alias)
+        if group is None:
+            group = [alias]
+            self._groups[alias] = group
+        self._leave(key)
+        group.append(key)
+        self._groups[key] = group
+        self._tracks[key] = self._tracks[alias]
+
+    def group(self, key: Key) -> list[Key]:
+        """
+        Retrieve the keys which share the record of a key, including the key.
+        """
+
+        return self._groups.get(key, [key])
+
+    def writable(self, key: Key, keys: Container[Key] = ()) -> Row:
+        """
+        Retrieve the record of a key in order to change it in place. If the
+        record is shared with keys that are not in `keys`, then the key gets
+        its own copy of the record first.
+        """
+
+        group = self._groups.get(key)
+        if group is not None and not all(alias in keys for alias in group):
+            self._leave(key)
+            self._tracks[key] = self._tracks[key].copy()
+        return self._tracks[key]
+
+    def _leave(self, key: Key) -> None:
+        group = self._groups.pop(key, None)
+        if group is not None:
+            group.remove(key)
+            if len(group) == 1:
+                del self._groups[group[0]]
+
+    @override
+    def __getitem__(self, key: Key) -> Row:
+        return self._tracks[key]
+
+    @override
+    def __setitem__(self, key: Key, value: Row) -> None:
+        self._leave(key)
+        self._tracks[key] = value
+
+    @override
+    def __delitem__(self, key: Key) -> None:
+        self._leave(key)
+        del self._tracks[key]
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        return key in self._tracks
+
+    @override
+    def __iter__(self) -> Iterator[Key]:
+        return iter(self._tracks)
+
+    @override
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+
 class Base(ABC):
     """
     Base file reader based on field information.
@@ -217,9 +728,12 @@ class Base(ABC):
             self._year = year
 
         self._positions: Positions = {}
-        self._tracks: Tracks = {}
+        self._tracks: Tracks = SharedTracks()
+        self._table: TrackTable | None = None
         self._artists: Artists = {}
         self._last_time: str | None = None
+        self._names: NormalizedNames = ({}, {}, {})
+        self._inputs: dict[str, str] = {}
         self.reset()
 
         # Set year or use latest year, optionally update field holder
@@ -262,6 +776,17 @@ class Base(ABC):
 
         raise NotImplementedError("Must be defined by subclasses")
 
+    @property
+    def field_sections(self) -> tuple[str, ...]:
+        """
+        Retrieve the names of the sections in the field settings file that
+        this reader uses, including the settings of each year.
+        """
+
+        if self.input_format is None:
+            return ("years",)
+        return ("years", self.input_format)
+
     @property
     def years(self) -> list[float]:
         """
@@ -313,6 +838,19 @@ class Base(ABC):
             year = self._year
         return self._fields.get_int_field(year, input_format, key, default)
 
+    def _get_float_field(
+        self,
+        key: str,
+        default: float = 0.0,
+        input_format: str | Literal[True] | None = True,
+        year: float | None = None,
+    ) -> float:
+        if input_format is True:
+            input_format = self.input_format
+        if year is None:
+            year = self._year
+        return self._fields.get_float_field(year, input_format, key, default)
+
     def _get_path_field(
         self,
         key: str,
@@ -339,9 +877,11 @@ class Base(ABC):
         """
 
         self._positions = {}
-        self._tracks = {}
+        self._tracks = SharedTracks()
+        self._table = None
         self._artists = {}
         self._last_time = None
+        self._inputs = {}
 
     def reset_year(self) -> None:
         """
@@ -360,14 +900,26 @@ class Base(ABC):
         return self._positions
 
     @property
-    def tracks(self) -> Tracks:
+    def tracks(self) -> TrackView:
         """
         Retrieve parsed track data which maps artist and track keys to fields.
         Multiple keys could refer to the same track through alternative keys.
         """
 
+        if self._table is not None:
+            return self._table
         return self._tracks
 
+    def compact(self) -> None:
+        """
+        Replace the parsed track data with a compact read-only table once all
+        files are read. Reading files again after this resets the reader.
+        """
+
+        if self._tracks or self._table is None:
+            self._table = TrackTable(self._tracks)
+            self._tracks = SharedTracks()
+
     @property
     def artists(self) -> Artists:
         """
@@ -395,6 +947,105 @@ class Base(ABC):
 
         return {}
 
+    @property
+    def inputs(self) -> dict[str, str]:
+        """
+        Retrieve the content hashes of the settings files and the input files
+        that the parsed data is based on, keyed by their paths.
+        """
+
+        return {
+            "fields.toml": self._fields.digest,
+            "fixes.toml": Normalizer.get_instance().fixes_hash,
+            **self._inputs,
+        }
+
+    def _record_input(self, path: Path) -> None:
+        with path.open("rb") as input_file:
+            self._inputs[str(path)] = hashlib.file_digest(
+                input_file, "sha256"
+            ).hexdigest()
+
+    def _merge_inputs(self, reader: "Base") -> None:
+        self._inputs.update(reader.inputs)
+
+    def normalize_names(
+        self, rows: Iterable[Row], fields: FieldMap
+    ) -> NormalizedNames:
+        """
+        Normalize the artist and title names of rows ahead of reading them.
+        The returned album version titles, artist alternatives and title
+        alternatives can be provided to `preload_names` of a reader which reads
+        the same rows, possibly in another process.
+        """
+
+        normalizer = Normalizer.get_instance()
+        album_versions, artists, titles = self._names
+        for row in rows:
+            if fields["artist"] not in row or fields["title"] not in row:
+                continue
+
+            artist = str(row[fields["artist"]])
+            if artist not in artists:
+                artists[artist] = normalizer.find_artist_alternatives(artist)
+            title = str(row[fields["title"]])
+            if title not in album_versions:
+                album_versions[title] = normalizer.check_album_version(title)
+            title = album_versions[title]
+            if title not in titles:
+                titles[title] = normalizer.find_title_alternatives(title)
+
+        return self._names
+
+    def preload_names(self, names: NormalizedNames) -> None:
+        """
+        Use normalized artist and title names from `normalize_names` instead of
+        normalizing them again while reading rows.
+        """
+
+        self._names = names
+
+    def _get_position(
+        self, row: Row, fields: FieldMap, offset: int = 0
+    ) -> int | None:
+        pos_field = fields.get("pos", "position")
+        if pos_field not in row or row[pos_field] == "":
+            return None
+        position = int(row[pos_field]) + offset
+        return position if position > 0 else None
+
+    def _read_rows(
+        self,
+        rows: Iterable[Row],
+        fields: FieldMap,
+        offset: int = 0,
+        seen_positions: set[int] | None = None,
+    ) -> None:
+        """
+        Read rows of a file and sort the artist charts afterward. If a set of
+        `seen_positions` is provided, then rows with positions which were in
+        the set before reading are skipped, and the positions of other rows
+        are added to the set, so that rows added to the file later on can be
+        read against the existing data.
+        """
+
+        read_positions: set[int] = set()
+        for row in rows:
+            if seen_positions is not None:
+                position = self._get_position(row, fields, offset)
+                if position in seen_positions:
+                    # Do not use a timestamp row for the skipped row
+                    self._last_time = None
+                    continue
+                if position is not None:
+                    read_positions.add(position)
+
+            _ = self._read_row(row, fields, offset=offset)
+
+        if seen_positions is not None:
+            seen_positions.update(read_positions)
+        self._sort_artist_charts(self._artists)
+
     def _read_row(
         self, row: Row, fields: FieldMap, offset: int = 0
     ) -> tuple[Key | None, int | None]:
@@ -402,15 +1053,11 @@ class Base(ABC):
         Read data extracted from a CSV row or JSON array element.
         """
 
+        PROFILER.count("rows", self._year)
         self._check_album_version(row, fields["title"])
         self._check_timestamp(row, fields.get("timestamp"))
 
-        pos_field = fields.get("pos", "position")
-        position = (
-            int(row[pos_field]) + offset
-            if pos_field in row and int(row[pos_field]) + offset > 0
-            else None
-        )
+        position = self._get_position(row, fields, offset)
         if position is not None:
             row[str(int(self._year))] = position
         row[f"{self.input_format}{int(self._year)}"] = True
@@ -418,36 +1065,40 @@ class Base(ABC):
         self._clear_previous_years(row, fields)
 
         best_key, keys, rejected_keys = self._update_keys(position, row, fields)
-        LOGGER.track(
-            "smashing pumpkins",
-            best_key[0],
-            self._year,
-            best_key,
-            keys,
-            rejected_keys,
-        )
+        if LOGGER.tracing:
+            LOGGER.track(
+                "keys",
+                best_key[0],
+                self._year,
+                best_key,
+                keys,
+                rejected_keys,
+            )
         for key in keys:
-            if self._tracks[key].get("best") is not True:
-                self._tracks[key]["best"] = best_key[0]
-                self._tracks[key]["best_title"] = best_key[1]
+            # Aliases which share a record all receive the same changes
+            track = self._writable_track(key, keys)
+            if track.get("best") is not True:
+                track["best"] = best_key[0]
+                track["best_title"] = best_key[1]
             if position is not None:
-                self._tracks[key][str(int(self._year))] = position
-
-        LOGGER.track(
-            str(row[fields["title"]]),
-            "Zombie",
-            self._year,
-            best_key,
-            keys,
-            rejected_keys,
-            position,
-        )
+                track[str(int(self._year))] = position
+
+        if LOGGER.tracing:
+            LOGGER.track(
+                "position",
+                str(row[fields["title"]]),
+                self._year,
+                best_key,
+                keys,
+                rejected_keys,
+                position,
+            )
         if position is not None:
-            self._tracks[best_key][str(int(self._year))] = position
+            self._writable_track(best_key)[str(int(self._year))] = position
 
         year_field = fields.get("year", "year")
         if year_field in row:
-            self._tracks[best_key]["jaar"] = row[year_field]
+            self._writable_track(best_key)["jaar"] = row[year_field]
 
         self._set_position_keys(position, best_key, keys, rejected_keys, fields)
         return best_key, position
@@ -468,7 +1119,9 @@ class Base(ABC):
         # Album version indicator
         # For older years, this is removed in the title alternatives
         title = str(row[title_field])
-        new_title = Normalizer.get_instance().check_album_version(title)
+        new_title = self._names[0].get(title)
+        if new_title is None:
+            new_title = Normalizer.get_instance().check_album_version(title)
         if title != new_title:
             row[f"album_version{int(self._year)}"] = True
             row[title_field] = new_title
@@ -487,8 +1140,14 @@ class Base(ABC):
         normalizer = Normalizer.get_instance()
         orig_artist = str(row[fields["artist"]])
         orig_title = str(row[fields["title"]])
-        artist_alternatives = normalizer.find_artist_alternatives(orig_artist)
-        title_alternatives = normalizer.find_title_alternatives(orig_title)
+        artist_alternatives = self._names[1].get(orig_artist)
+        if artist_alternatives is None:
+            artist_alternatives = normalizer.find_artist_alternatives(
+                orig_artist
+            )
+        title_alternatives = self._names[2].get(orig_title)
+        if title_alternatives is None:
+            title_alternatives = normalizer.find_title_alternatives(orig_title)
 
         best_key, keys, rejected_keys = self._find_keys(
             row, fields, artist_alternatives, title_alternatives
@@ -522,6 +1181,13 @@ class Base(ABC):
 
         keys: KeySet = {}
         rejected_keys: KeySet = {}
+        aliases = {
+            (artist.lower().strip(), title.lower().strip())
+            for artist, title in product(
+                artist_alternatives, title_alternatives
+            )
+        }
+        new_key: Key | None = None
         for artist, title in product(artist_alternatives, title_alternatives):
             key = (artist.lower().strip(), title.lower().strip())
             # Ignore alternative-pairs which we have seen this year.
@@ -529,8 +1195,26 @@ class Base(ABC):
             if key in keys or key in rejected_keys:
                 continue
 
+            if key not in self._tracks:
+                best_key, _ = self._update_row(
+                    key, row, fields=fields, best_key=best_key, alias=new_key
+                )
+                new_key = key if new_key is None else new_key
+                keys[key] = True
+                continue
+            if isinstance(self._tracks, SharedTracks) and any(
+                alias in keys for alias in self._tracks.group(key)
+            ):
+                # The row is merged into the record shared with an alias
+                PROFILER.count("shared_keys", self._year)
+                best_key = self._redirect_best_key(
+                    key, self._tracks[key], best_key
+                )
+                keys[key] = True
+                continue
+
             best_key, valid = self._update_row(
-                key, row, fields=fields, best_key=best_key
+                key, row, fields=fields, best_key=best_key, aliases=aliases
             )
             if valid:
                 keys[key] = True
@@ -540,6 +1224,8 @@ class Base(ABC):
         if best_key is None:
             best_key = key  # original artist/title combination
 
+        PROFILER.count("keys", self._year, len(keys))
+        PROFILER.count("rejected_keys", self._year, len(rejected_keys))
         return best_key, keys, rejected_keys
 
     @overload
@@ -549,6 +1235,8 @@ class Base(ABC):
         row: Row,
         fields: FieldMap | None = None,
         best_key: Key = ...,
+        alias: Key | None = None,
+        aliases: Container[Key] = (),
     ) -> tuple[Key, bool]: ...
 
     @overload
@@ -558,6 +1246,8 @@ class Base(ABC):
         row: Row,
         fields: FieldMap | None = None,
         best_key: Key | None = None,
+        alias: Key | None = None,
+        aliases: Container[Key] = (),
     ) -> tuple[Key | None, bool]: ...
 
     def _update_row(
@@ -566,9 +1256,13 @@ class Base(ABC):
         row: Row,
         fields: FieldMap | None = None,
         best_key: Key | None = None,
+        alias: Key | None = None,
+        aliases: Container[Key] = (),
     ) -> tuple[Key | None, bool]:
         """
-        Update data for a track.
+        Update data for a track. A new track shares the record of an `alias`
+        key that was stored for the same row, if provided. The row is merged
+        into a record that is shared with other `aliases` of the row in place.
         """
 
         if fields is None:
@@ -576,27 +1270,33 @@ class Base(ABC):
         pos_field = fields.get("pos", "position")
 
         if key not in self._tracks:
+            if LOGGER.tracing:
+                LOGGER.track(
+                    "new track",
+                    "/".join(key),
+                    key,
+                    best_key,
+                    row,
+                    self._year,
+                )
+            if alias is not None and isinstance(self._tracks, SharedTracks):
+                self._tracks.share(key, alias)
+            else:
+                self._tracks[key] = row.copy()
+            return best_key, True
+
+        track = self._tracks[key]
+        if LOGGER.tracing:
             LOGGER.track(
-                "danny vera/roller coaster",
+                "existing track",
                 "/".join(key),
                 key,
                 best_key,
+                track,
                 row,
-                self._year,
             )
-            self._tracks[key] = row.copy()
-            return best_key, True
-
-        new_row = row.copy()
-        LOGGER.track(
-            "queen/somebody to love",
-            "/".join(key),
-            key,
-            best_key,
-            self._tracks[key],
-            row,
-        )
         if self._check_collision(key, pos_field):
+            PROFILER.count("collisions", self._year)
             LOGGER.debug(
                 "Potential collision (%d: %r %r %r %r",
                 self._year,
@@ -611,30 +1311,48 @@ class Base(ABC):
                 and "best" in self._tracks[key]
                 and self._tracks[key]["best"] is not True
             ):
-                LOGGER.track(
-                    "elton john",
-                    str(row[fields.get("artist", "artiest")]).lower(),
-                    "Collision",
-                    self._year,
-                    key,
-                    best_key,
-                    row,
-                    self._tracks[key],
-                )
-                self._tracks[key] = new_row
+                if LOGGER.tracing:
+                    LOGGER.track(
+                        "collision",
+                        str(row[fields.get("artist", "artiest")]),
+                        self._year,
+                        key,
+                        best_key,
+                        row,
+                        track,
+                    )
+                self._tracks[key] = row.copy()
 
             return best_key, False
 
-        new_row.update(self._tracks[key])
-        if "best" in new_row:
-            best_key = (
+        # Merge the row into the track without replacing existing fields
+        track = self._writable_track(key, aliases)
+        for field, value in row.items():
+            _ = track.setdefault(field, value)
+
+        return self._redirect_best_key(key, track, best_key), True
+
+    @staticmethod
+    def _redirect_best_key(
+        key: Key, track: Row, best_key: Key | None
+    ) -> Key | None:
+        if "best" in track:
+            return (
                 key
-                if new_row["best"] is True
-                else (str(new_row["best"]), str(new_row["best_title"]))
+                if track["best"] is True
+                else (str(track["best"]), str(track["best_title"]))
             )
+        return best_key
+
+    def _writable_track(self, key: Key, keys: Container[Key] = ()) -> Row:
+        """
+        Retrieve a track in order to change it in place, which is only shared
+        with aliases if the same change is made for all `keys`.
+        """
 
-        self._tracks[key] = new_row
-        return best_key, True
+        if isinstance(self._tracks, SharedTracks):
+            return self._tracks.writable(key, keys)
+        return self._tracks[key]
 
     def _check_collision(self, key: Key, pos_field: str | None) -> bool:
         """
@@ -643,7 +1361,14 @@ class Base(ABC):
 
         track = self._tracks[key]
         if self._is_current_year:
-            return pos_field is not None and pos_field in track
+            if pos_field is None or pos_field not in track:
+                return False
+            # Tracks from a table of all years may have position fields of
+            # older years, so only a row of the current year file collides
+            return (
+                not isinstance(self._tracks, TrackChanges)
+                or f"{self.input_format}{int(self._year)}" in track
+            )
         return f"{self.input_format}{int(self._year)}" in track
 
     def _update_best_key(
@@ -659,15 +1384,16 @@ class Base(ABC):
             "titel": fields.get("title", "titel"),
             "pos": "",
         }
-        LOGGER.track(
-            "iron butterfly",
-            artist_alternatives[-1].lower(),
-            self._year,
-            artist_alternatives,
-            title_alternatives,
-            best_key,
-            row[update_fields["artist"]],
-        )
+        if LOGGER.tracing:
+            LOGGER.track(
+                "best key",
+                artist_alternatives[-1],
+                self._year,
+                artist_alternatives,
+                title_alternatives,
+                best_key,
+                row[update_fields["artist"]],
+            )
         old_current_year = self._is_current_year
         self._is_current_year = True
         best_key = self._update_row(
@@ -681,14 +1407,16 @@ class Base(ABC):
         ):
             # Collision was detected, possibly update the merged row
             # Update to best combination for current year
-            self._tracks[best_key]["artiest"] = artist_alternatives[-1]
-            self._tracks[best_key]["titel"] = title_alternatives[-1]
-            LOGGER.track(
-                "Hou Van Mij",
-                str(self._tracks[best_key]["titel"]),
-                title_alternatives,
-                self._tracks[best_key],
-            )
+            track = self._writable_track(best_key)
+            track["artiest"] = artist_alternatives[-1]
+            track["titel"] = title_alternatives[-1]
+            if LOGGER.tracing:
+                LOGGER.track(
+                    "best title",
+                    str(self._tracks[best_key]["titel"]),
+                    title_alternatives,
+                    self._tracks[best_key],
+                )
 
         return best_key, False
 
@@ -716,31 +1444,45 @@ class Base(ABC):
             rejected_keys,
         )
         if position is not None and self._is_current_year:
-            self._tracks[best_key]["best"] = True
+            self._writable_track(best_key)["best"] = True
             for key in chain([best_key], keys, rejected_keys):
                 _ = self._artists.setdefault(key[0], [])
-                LOGGER.track(
-                    "Mary J",
-                    str(
-                        self._tracks[best_key][fields.get("artist", "artiest")]
-                    ),
-                    position,
-                    key,
-                    self._artists[key[0]],
-                )
-                if position not in self._artists[key[0]]:
-                    bisect.insort(self._artists[key[0]], position)
+                if LOGGER.tracing:
+                    LOGGER.track(
+                        "artist chart",
+                        str(
+                            self._tracks[best_key][
+                                fields.get("artist", "artiest")
+                            ]
+                        ),
+                        position,
+                        key,
+                        self._artists[key[0]],
+                    )
+                self._artists[key[0]].append(position)
+
+    @staticmethod
+    def _sort_artist_charts(artists: Artists) -> None:
+        """
+        Sort the positions of artist charts in bulk and remove duplicates once
+        a chart is read, since positions are appended to them while reading.
+        """
+
+        for chart in artists.values():
+            chart[:] = sorted(set(chart))
 
     def _set_accepted_keys(
         self, position: int | None, keys: list[Key], rejected_keys: KeySet
     ) -> None:
         if position is not None:
-            LOGGER.track(
-                "don't let the sun go down on me",
-                keys[0][0],
-                keys,
-                rejected_keys,
-            )
+            if LOGGER.tracing:
+                LOGGER.track(
+                    "accepted keys",
+                    keys[0][0],
+                    position,
+                    keys,
+                    rejected_keys,
+                )
             self._positions[position] = keys
 
     def select_relevant_keys(
@@ -779,9 +1521,15 @@ class Base(ABC):
     ) -> Key | None:
         if key[0] in primary.artists:
             chart = tuple(primary.artists[key[0]])
-            LOGGER.track(
-                key[0], ("gotye", "kimbra"), key, chart, one, relevant_keys
-            )
+            if LOGGER.tracing:
+                LOGGER.track(
+                    "relevant key",
+                    key[0],
+                    key,
+                    chart,
+                    one,
+                    relevant_keys,
+                )
             if len(chart) == 1:
                 normalizer = Normalizer.get_instance()
                 if one is None and not normalizer.find_artist_splits(key[0])[1]:
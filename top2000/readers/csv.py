@@ -3,12 +3,22 @@ NPO Radio 2 Top 2000 CSV reader.
 """
 
 import csv
+from collections.abc import Iterator
 from pathlib import Path
 from typing import final
 
 from typing_extensions import override
 
-from .base import Artists, Base, FieldMap, Key, Positions, Row, Tracks
+from .base import (
+    Artists,
+    Base,
+    FieldMap,
+    Key,
+    Positions,
+    PreparedFile,
+    Row,
+    Tracks,
+)
 
 
 @final
@@ -28,15 +38,85 @@ class CSV(Base):
         csv_path = Path(csv_name_format.format(int(self._year)))
         self.read_file(csv_path)
 
+    def _get_fields(self) -> FieldMap:
+        return {
+            "pos": self._get_str_field("pos", "positie"),
+            "artist": self._get_str_field("artist", "artiest"),
+            "title": self._get_str_field("title", "titel"),
+            "year": self._get_str_field("year", "jaar"),
+            "prv": self._get_str_field("prv", "prv"),
+        }
+
+    def _select_columns(self, header: list[str]) -> list[tuple[int, str]]:
+        """
+        Select the indexes and names of columns which are used when reading
+        rows: the configured fields and positions of years in overview files.
+        If a column name occurs more than once, then the last column is used.
+        """
+
+        names = set(self._get_fields().values())
+        columns = {
+            name: index
+            for index, name in enumerate(header)
+            if name in names or name.isnumeric()
+        }
+        return [(index, name) for name, index in columns.items()]
+
+    def _load_rows(self, csv_path: Path) -> Iterator[Row]:
+        """
+        Parse the rows of a CSV file as lists of cells and only convert the
+        cells of selected columns to fields of rows.
+        """
+
+        encoding = self._get_str_field("encoding", "utf-8")
+        with csv_path.open("r", encoding=encoding) as csv_file:
+            for _ in range(self._get_int_field("skip", 0)):
+                _ = csv_file.readline()
+            reader = csv.reader(
+                csv_file, delimiter=self._get_str_field("delimiter", ",")
+            )
+            try:
+                header = next(reader)
+            except StopIteration:
+                return
+
+            columns = self._select_columns(header)
+            width = max((index + 1 for index, _ in columns), default=0)
+            for cells in reader:
+                if not cells:
+                    continue
+                if len(cells) < width:
+                    yield {
+                        name: cells[index]
+                        for index, name in columns
+                        if index < len(cells)
+                    }
+                    continue
+                yield {name: cells[index] for index, name in columns}
+
+    def prepare_file(self, csv_path: Path) -> PreparedFile:
+        """
+        Load the rows of a CSV file with track position data and normalize
+        their names, without reading the tracks yet.
+        """
+
+        rows: list[Row] = list(self._load_rows(csv_path))
+        return rows, self.normalize_names(rows, self._get_fields())
+
     def read_file(
         self,
         csv_path: Path,
         positions: Positions | None = None,
         tracks: Tracks | None = None,
         artists: Artists | None = None,
+        prepared: PreparedFile | None = None,
+        seen_positions: set[int] | None = None,
     ) -> None:
         """
-        Read a CSV file with track position data.
+        Read a CSV file with track position data. If the file was prepared
+        already, then the rows and normalized names from `prepared` are used.
+        If a set of `seen_positions` is provided, then only rows with other
+        positions are read and their positions are added to the set.
         """
 
         self.reset()
@@ -46,23 +126,18 @@ class CSV(Base):
             self._tracks = tracks
         if artists is not None:
             self._artists = artists
+        self._record_input(csv_path)
 
-        encoding = self._get_str_field("encoding", "utf-8")
-        fields = {
-            "pos": self._get_str_field("pos", "positie"),
-            "artist": self._get_str_field("artist", "artiest"),
-            "title": self._get_str_field("title", "titel"),
-            "year": self._get_str_field("year", "jaar"),
-        }
+        fields = self._get_fields()
         offset = self._get_int_field("offset", 0)
-        with csv_path.open("r", encoding=encoding) as csv_file:
-            for _ in range(self._get_int_field("skip", 0)):
-                _ = csv_file.readline()
-            reader = csv.DictReader(
-                csv_file, delimiter=self._get_str_field("delimiter", ",")
-            )
-            for row in reader:
-                _ = self._read_row(row, fields, offset=offset)
+        if prepared is None:
+            rows = self._load_rows(csv_path)
+        else:
+            rows = iter(prepared[0])
+            self.preload_names(prepared[1])
+        self._read_rows(
+            rows, fields, offset=offset, seen_positions=seen_positions
+        )
 
     @override
     def _read_row(
@@ -0,0 +1,152 @@
+"""
+HTTP retrieval with timeouts, retries, compression and revalidation.
+"""
+
+import gzip
+import sys
+import time
+from email.message import Message
+from http.client import HTTPException, HTTPResponse
+from typing import IO, cast, final
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from typing_extensions import TypedDict, override
+
+from .. import __version__ as module_version
+from ..logging import LOGGER
+
+
+class Validators(TypedDict, total=False):
+    """
+    Validators of a retrieved resource, which are sent along with a later
+    request so that the server can indicate that the resource is unchanged.
+    """
+
+    etag: str
+    last_modified: str
+
+
+class FetchError(URLError):
+    """
+    Error indicating a problem when retrieving a resource.
+    """
+
+    @override
+    def __str__(self) -> str:
+        return str(self.reason)
+
+
+@final
+class Fetcher:
+    """
+    Retriever of HTTP resources. Requests time out after a number of seconds
+    and are attempted again after connection errors, timeouts and server
+    errors, with a delay that doubles after every attempt. Responses may be
+    compressed with gzip.
+    """
+
+    RETRY_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+    def __init__(
+        self, timeout: float = 30.0, retries: int = 3, backoff: float = 1.0
+    ) -> None:
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+
+        python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+        self._headers = {
+            "User-Agent": f"top2000/{module_version} python/{python_version}",
+            "Accept-Encoding": "gzip",
+        }
+
+    @staticmethod
+    def _get_validators(headers: Message) -> Validators:
+        validators: Validators = {}
+        if (etag := headers.get("ETag")) is not None:
+            validators["etag"] = etag
+        if (last_modified := headers.get("Last-Modified")) is not None:
+            validators["last_modified"] = last_modified
+        return validators
+
+    def _request(
+        self, url: str, validators: Validators
+    ) -> tuple[bytes, Validators] | None:
+        headers = self._headers.copy()
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        request = Request(url, headers=headers)  # noqa: S310
+        try:
+            with urlopen(request, timeout=self._timeout) as response:  # noqa: S310 # pyright: ignore[reportAny]
+                if not isinstance(response, HTTPResponse):
+                    raise FetchError("Unexpected return type for urlopen")
+                body = response.read()
+                if response.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                return body, self._get_validators(response.headers)
+        except HTTPError as error:
+            if error.code == 304:
+                return None
+            raise
+
+    @staticmethod
+    def _read_error_body(error: HTTPError) -> str:
+        # An HTTP error may have no response body to read, for example if
+        # the connection was closed before the body was received
+        body_file = cast(IO[bytes] | None, error.fp)
+        if body_file is None:
+            return ""
+        try:
+            return body_file.read().decode("utf-8", errors="replace")
+        except OSError:
+            return ""
+
+    def fetch(
+        self, url: str, validators: Validators | None = None
+    ) -> tuple[bytes, Validators] | None:
+        """
+        Retrieve the body of a resource along with its validators. If the
+        validators of an earlier response are provided and the server
+        indicates that the resource is unchanged, then `None` is returned.
+        """
+
+        if not url.startswith(("http:", "https:")):
+            raise FetchError("Attempt to read from non-HTTP URL")
+
+        attempt = 0
+        while True:
+            try:
+                return self._request(
+                    url, {} if validators is None else validators
+                )
+            except HTTPError as error:
+                if (
+                    error.code not in self.RETRY_STATUS
+                    or attempt >= self._retries
+                ):
+                    body = self._read_error_body(error)
+                    message = f"Unexpected status code {error.code} from {url}"
+                    raise FetchError(f"{message}: {body}") from error
+                reason = f"status code {error.code}"
+            except (URLError, HTTPException, OSError) as error:
+                if isinstance(error, FetchError):
+                    raise
+                if attempt >= self._retries:
+                    raise FetchError(f"Connection error for {url}") from error
+                reason = str(error)
+
+            delay = self._backoff * 2.0**attempt
+            attempt += 1
+            LOGGER.warning(
+                "Retrieving %s failed (%s), attempt %d of %d in %g seconds",
+                url,
+                reason,
+                attempt,
+                self._retries,
+                delay,
+            )
+            time.sleep(delay)
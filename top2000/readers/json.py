@@ -3,12 +3,24 @@ NPO Radio 2 Top 2000 JSON API file reader.
 """
 
 import json
+import re
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import TypeVar, cast, final
+from typing import ClassVar, TextIO, TypeVar, cast, final
 
 from typing_extensions import override
 
-from .base import Artists, Base, Positions, Row, RowElement, Tracks
+from .base import (
+    Artists,
+    Base,
+    FieldMap,
+    Positions,
+    PreparedFile,
+    Row,
+    RowElement,
+    RowPath,
+    Tracks,
+)
 
 Rows = list[Row] | dict[str | int, "Rows"]
 NestedRow = dict[str, Row | RowElement]
@@ -18,6 +30,140 @@ NestedRows = (
 RowT = TypeVar("RowT", Row, NestedRow)
 
 
+class StreamError(ValueError):
+    """
+    Error indicating that a JSON document does not have the layout that the
+    incremental reader expects.
+    """
+
+
+@final
+class RowStream:
+    """
+    Incremental reader of a JSON document which follows a path of object keys
+    and array indexes to an array and then decodes its elements one at a time.
+    Values which are not on the path are decoded and discarded right away.
+    Unlike a full decode, the first occurrence of a duplicate object key is
+    followed.
+    """
+
+    chunk_size: ClassVar[int] = 65536
+    _whitespace: ClassVar[re.Pattern[str]] = re.compile(r"[ \t\n\r]*")
+    _delimiters: ClassVar[frozenset[str]] = frozenset(" \t\n\r,:]}")
+
+    def __init__(self, json_file: TextIO) -> None:
+        self._file = json_file
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+
+        chunk = self._file.read(self.chunk_size)
+        if chunk == "":
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            match = self._whitespace.match(self._buffer, self._pos)
+            if match is not None:
+                self._pos = match.end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, tokens: str) -> str:
+        token = self._peek()
+        if token == "" or token not in tokens:
+            raise StreamError(
+                f"Expected one of {tokens!r} at {self._pos}, found {token!r}"
+            )
+        self._pos += 1
+        return token
+
+    def _decode(self) -> object:
+        _ = self._peek()
+        while True:
+            try:
+                value, end = cast(
+                    tuple[object, int],
+                    self._decoder.raw_decode(self._buffer, self._pos),
+                )
+            except json.JSONDecodeError:
+                # Value may continue in the next chunk
+                if self._fill():
+                    continue
+                raise
+
+            # Numbers and literals at the end of the chunk may be cut off
+            if (
+                end == len(self._buffer)
+                or self._buffer[end] not in self._delimiters
+            ) and self._fill():
+                continue
+
+            self._pos = end
+            return value
+
+    def follow(self, path: RowPath) -> None:
+        """
+        Move to the start of the array that the path of object keys and array
+        indexes refers to. If an object key or array index is missing, then
+        a `KeyError` or `IndexError` is raised, respectively.
+        """
+
+        for key_index in path:
+            if isinstance(key_index, str):
+                self._follow_key(key_index)
+            else:
+                self._follow_index(key_index)
+
+        _ = self._expect("[")
+
+    def _follow_key(self, key_index: str) -> None:
+        _ = self._expect("{")
+        if self._peek() == "}":
+            raise KeyError(key_index)
+        while True:
+            key = self._decode()
+            _ = self._expect(":")
+            if key == key_index:
+                return
+            _ = self._decode()
+            if self._expect(",}") == "}":
+                raise KeyError(key_index)
+
+    def _follow_index(self, key_index: int) -> None:
+        if key_index < 0:
+            raise StreamError("Unable to follow negative array index")
+        _ = self._expect("[")
+        if self._peek() == "]":
+            raise IndexError(key_index)
+        for _ in range(key_index):
+            _ = self._decode()
+            if self._expect(",]") == "]":
+                raise IndexError(key_index)
+
+    def __iter__(self) -> Iterator[object]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode()
+            if self._expect(",]") == "]":
+                return
+
+
 @final
 class JSON(Base):
     """
@@ -65,16 +211,95 @@ class JSON(Base):
                 )
             return cast(list[RowT], rows)
 
+    def _stream_rows(
+        self, json_path: Path, row_type: type[RowT]
+    ) -> Iterator[RowT]:
+        """
+        Decode the rows of a JSON file one at a time. If the rows path cannot
+        be followed incrementally, then the entire file is decoded instead.
+        """
+
+        with json_path.open("r", encoding="utf-8") as json_file:
+            stream = RowStream(json_file)
+            try:
+                stream.follow(self._get_path_field("rows"))
+            except (LookupError, ValueError):
+                pass
+            else:
+                for row in stream:
+                    yield cast(RowT, row)
+                return
+
+        yield from self._load_rows(json_path, row_type)
+
+    def _get_old_fields(self) -> FieldMap:
+        return {
+            "pos": self._get_str_field("pos", "position"),
+            "artist": self._get_str_field("artist", "artist"),
+            "title": self._get_str_field("title", "title"),
+            "year": self._get_str_field("year", "year"),
+            "prv": self._get_str_field("prv", "lastPosition"),
+        }
+
+    def _get_fields(self) -> FieldMap:
+        return {
+            "pos": "pos",
+            "artist": "artist",
+            "title": "title",
+            "prv": "prv",
+            # In primary object
+            "timestamp": self._get_str_field("time", "broadcastUnixTime"),
+        }
+
+    def _flatten_rows(self, rows: Iterable[NestedRow]) -> Iterator[Row]:
+        # In "position"
+        pos_field = self._get_str_field("pos", "current")
+        prv_field = self._get_str_field("prv", "previous")
+        # In "track"
+        artist_field = self._get_str_field("artist", "artist")
+        title_field = self._get_str_field("title", "title")
+
+        for row in rows:
+            new_row: Row = {}
+            for key, value in row.items():
+                if isinstance(value, (str, int, bool)):
+                    new_row[key] = value
+                elif key == "position":
+                    new_row["pos"] = value[pos_field]
+                    new_row["prv"] = value[prv_field]
+                elif key == "track":
+                    new_row["artist"] = value[artist_field]
+                    new_row["title"] = value[title_field]
+
+            yield new_row
+
+    def prepare_file(self, json_path: Path, old: bool = False) -> PreparedFile:
+        """
+        Load the rows of a JSON file with track position data, either in
+        a legacy JSON API response if `old` is enabled or with nested position
+        and track data otherwise, and normalize their names, without reading
+        the tracks yet.
+        """
+
+        if old:
+            rows = list(self._stream_rows(json_path, Row))
+            return rows, self.normalize_names(rows, self._get_old_fields())
+
+        rows = list(self._flatten_rows(self._stream_rows(json_path, NestedRow)))
+        return rows, self.normalize_names(rows, self._get_fields())
+
     def read_old_file(
         self,
         json_path: Path,
         positions: Positions | None = None,
         tracks: Tracks | None = None,
         artists: Artists | None = None,
+        prepared: PreparedFile | None = None,
     ) -> None:
         """
         Read a JSON file with track position data in a legacy JSON API response
-        with a flattened array of objects.
+        with a flattened array of objects. If the file was prepared already,
+        then the rows and normalized names from `prepared` are used.
         """
 
         self.reset()
@@ -84,18 +309,16 @@ class JSON(Base):
             self._tracks = tracks
         if artists is not None:
             self._artists = artists
+        self._record_input(json_path)
 
-        fields = {
-            "pos": self._get_str_field("pos", "position"),
-            "artist": self._get_str_field("artist", "artist"),
-            "title": self._get_str_field("title", "title"),
-            "year": self._get_str_field("year", "year"),
-            "prv": self._get_str_field("prv", "lastPosition"),
-        }
+        fields = self._get_old_fields()
 
-        rows = self._load_rows(json_path, Row)
-        for row in rows:
-            _ = self._read_row(row, fields)
+        if prepared is None:
+            rows = self._stream_rows(json_path, Row)
+        else:
+            rows = iter(prepared[0])
+            self.preload_names(prepared[1])
+        self._read_rows(rows, fields)
 
     def read_file(
         self,
@@ -103,10 +326,15 @@ class JSON(Base):
         positions: Positions | None = None,
         tracks: Tracks | None = None,
         artists: Artists | None = None,
+        prepared: PreparedFile | None = None,
+        seen_positions: set[int] | None = None,
     ) -> None:
         """
         Read a JSON file with track position data in an array of objects with
-        nested position and track data.
+        nested position and track data. If the file was prepared already, then
+        the rows and normalized names from `prepared` are used. If a set of
+        `seen_positions` is provided, then only rows with other positions are
+        read and their positions are added to the set.
         """
 
         self.reset()
@@ -116,35 +344,13 @@ class JSON(Base):
             self._tracks = tracks
         if artists is not None:
             self._artists = artists
+        self._record_input(json_path)
 
-        # In "position"
-        pos_field = self._get_str_field("pos", "current")
-        prv_field = self._get_str_field("prv", "previous")
-        # In "track"
-        artist_field = self._get_str_field("artist", "artist")
-        title_field = self._get_str_field("title", "title")
-        # In primary object
-        time_field = self._get_str_field("time", "broadcastUnixTime")
-
-        fields = {
-            "pos": "pos",
-            "artist": "artist",
-            "title": "title",
-            "prv": "prv",
-            "timestamp": time_field,
-        }
-
-        rows = self._load_rows(json_path, NestedRow)
-        for row in rows:
-            new_row: Row = {}
-            for key, value in row.items():
-                if isinstance(value, (str, int, bool)):
-                    new_row[key] = value
-                elif key == "position":
-                    new_row["pos"] = value[pos_field]
-                    new_row["prv"] = value[prv_field]
-                elif key == "track":
-                    new_row["artist"] = value[artist_field]
-                    new_row["title"] = value[title_field]
+        fields = self._get_fields()
 
-            _ = self._read_row(new_row, fields)
+        if prepared is None:
+            rows = self._flatten_rows(self._stream_rows(json_path, NestedRow))
+        else:
+            rows = iter(prepared[0])
+            self.preload_names(prepared[1])
+        self._read_rows(rows, fields, seen_positions=seen_positions)
@@ -2,18 +2,113 @@
 Multiple file reader.
 """
 
-import bisect
 from pathlib import Path
 from typing import final
 
 from typing_extensions import override
 
 from ..logging import LOGGER
-from .base import Artists, Base, FieldHolder, Positions, Row
+from ..profiling import PROFILER
+from .base import (
+    Artists,
+    Base,
+    FieldHolder,
+    Positions,
+    PreparedFile,
+    Row,
+    TrackChanges,
+)
 from .csv import CSV
 from .json import JSON
+from .snapshot import Snapshot
 
 OldFiles = tuple[tuple[float, str, str], ...]
+PreparedYear = tuple[PreparedFile | None, PreparedFile | None]
+
+
+def _use_old_json(fields: FieldHolder, year: float, json_path: Path) -> bool:
+    """
+    Check whether a JSON file for an old year should be read. Otherwise, update
+    the fields to read the position of the year from an overview CSV file.
+    """
+
+    if json_path.exists() and not fields.get_bool_field(year, "json", "skip"):
+        return True
+
+    # No JSON file, so use overview CSV (very old years)
+    # These are overview CSV files with possibly multiple years
+    # The current year position is stored in a "pos XXXX" field
+    fields.update_year(year, {"csv": {"pos": f"pos {int(year)}"}})
+    return False
+
+
+def _prepare_file(
+    reader: CSV | JSON,
+    fields: FieldHolder,
+    path: Path,
+    old: bool = False,
+    snapshots: bool = False,
+) -> PreparedFile:
+    """
+    Load and normalize an input file for a reader, or use a snapshot of an
+    earlier preparation of the file if it is still valid.
+    """
+
+    with PROFILER.phase("prepare", reader.year):
+        snapshot: Snapshot | None = None
+        if snapshots:
+            snapshot = Snapshot(
+                path,
+                fields.get(reader.year, {}),
+                f"{reader.input_format}{'-old' if old else ''}",
+            )
+            prepared = snapshot.load()
+            if prepared is not None:
+                return prepared
+
+        if isinstance(reader, JSON):
+            prepared = reader.prepare_file(path, old=old)
+        else:
+            prepared = reader.prepare_file(path)
+        if snapshot is not None:
+            snapshot.save(prepared)
+        return prepared
+
+
+def _prepare_old_year(
+    fields: FieldHolder,
+    year: float,
+    csv_name: str,
+    json_name: str,
+    snapshots: bool = False,
+) -> PreparedYear:
+    """
+    Load and normalize the JSON and CSV files of an old year from snapshots
+    or parse them and store snapshots for later reading.
+    """
+
+    prepared_json: PreparedFile | None = None
+    prepared_csv: PreparedFile | None = None
+    json_path = Path(json_name)
+    if _use_old_json(fields, year, json_path):
+        prepared_json = _prepare_file(
+            JSON(year, is_current_year=False, fields=fields),
+            fields,
+            json_path,
+            old=fields.get_bool_field(year, "json", "old"),
+            snapshots=snapshots,
+        )
+
+    csv_path = Path(csv_name)
+    if csv_path.exists():
+        prepared_csv = _prepare_file(
+            CSV(year, is_current_year=False, fields=fields),
+            fields,
+            csv_path,
+            snapshots=snapshots,
+        )
+
+    return prepared_json, prepared_csv
 
 
 @final
@@ -37,17 +132,24 @@ class Years(Base):
         )
         self._year_positions: dict[float, Positions] = {}
         self._year_artists: dict[float, Artists] = {}
+        self._seen_positions: dict[str, set[int]] = {}
 
     @property
     @override
     def input_format(self) -> str | None:
         return None
 
+    @property
+    @override
+    def field_sections(self) -> tuple[str, ...]:
+        return ("years", "csv", "json")
+
     @override
     def reset(self) -> None:
         super().reset()
         self._year_positions = {}
         self._year_artists = {}
+        self._seen_positions = {}
         self.reset_year()
 
     @override
@@ -94,104 +196,194 @@ class Years(Base):
         current_year_csv: str | None = None,
         current_year_json: str | None = None,
         old: OldFiles | None = None,
+        snapshots: bool = False,
     ) -> None:
         """
         Read JSON and/or CSV files for the current year as well as older years.
+        If `snapshots` is enabled, then files which were loaded and normalized
+        in an earlier run with the same settings are not parsed again.
         """
 
         self.reset()
 
         # Read current year
         if current_year_json is not None and current_year_json != "":
+            json_path = Path(current_year_json)
             json = JSON(self._year, fields=self._fields)
             json.read_file(
-                Path(current_year_json),
+                json_path,
                 positions=self._year_positions.get(self._year),
                 tracks=self._tracks,
                 artists=self._artists,
+                prepared=_prepare_file(
+                    json, self._fields, json_path, snapshots=True
+                )
+                if snapshots
+                else None,
+                seen_positions=self._seen_positions.setdefault("json", set()),
             )
             self._positions = self._year_positions[self._year] = json.positions
             self._artists = self._year_artists[self._year] = json.artists
+            self._merge_inputs(json)
         if current_year_csv is not None and current_year_csv != "":
+            csv_path = Path(current_year_csv)
             csv = CSV(self._year, fields=self._fields)
             csv.read_file(
-                Path(current_year_csv),
+                csv_path,
                 positions=self._positions,
                 tracks=self._tracks,
                 artists=self._artists,
+                prepared=_prepare_file(
+                    csv, self._fields, csv_path, snapshots=True
+                )
+                if snapshots
+                else None,
+                seen_positions=self._seen_positions.setdefault("csv", set()),
             )
             self._positions = self._year_positions[self._year] = csv.positions
             self._artists = self._year_artists[self._year] = csv.artists
+            self._merge_inputs(csv)
+
+        if old is not None:
+            with PROFILER.phase("read_old"):
+                self._read_old_files(old, snapshots=snapshots)
 
+        self.compact()
         if old is not None:
-            self._read_old_files(old)
-            self._fill_old_year_overview()
+            with PROFILER.phase("overview"):
+                self._fill_old_year_overview()
+
+    def update_files(
+        self,
+        current_year_csv: str | None = None,
+        current_year_json: str | None = None,
+    ) -> None:
+        """
+        Read rows which were added to the JSON and/or CSV files of the current
+        year after all files were read, such as new positions revealed during
+        the broadcast. Rows of positions that were read from a file before are
+        skipped. The new rows are read against the tracks of all years and
+        only the tracks that they change are stored in the table again, so
+        the time spent depends on the number of new positions. New tracks may
+        be merged differently with tracks of older years than when all files
+        are read again.
+        """
+
+        assert self._table is not None, "Files must be read before updating"
+        tracks = TrackChanges(self._table)
+        if current_year_json is not None and current_year_json != "":
+            json = JSON(self._year, fields=self._fields)
+            json.read_file(
+                Path(current_year_json),
+                positions=self._positions,
+                tracks=tracks,
+                artists=self._artists,
+                seen_positions=self._seen_positions.setdefault("json", set()),
+            )
+            self._merge_inputs(json)
+        if current_year_csv is not None and current_year_csv != "":
+            csv = CSV(self._year, fields=self._fields)
+            csv.read_file(
+                Path(current_year_csv),
+                positions=self._positions,
+                tracks=tracks,
+                artists=self._artists,
+                seen_positions=self._seen_positions.setdefault("csv", set()),
+            )
+            self._merge_inputs(csv)
 
-    def _read_old_files(self, old: OldFiles) -> None:
+        LOGGER.info(
+            "Updated %d tracks for year %g", len(tracks.changes), self._year
+        )
+        self._table.store(tracks.changes)
+
+    def _read_old_files(self, old: OldFiles, snapshots: bool = False) -> None:
         """
         Read files from earlier years, potentially with multiple year data
         in them.
         """
 
         for year, overview_csv_name, overview_json_name in old:
-            overview_json_path = Path(overview_json_name)
-            skip_json = self._fields.get_bool_field(year, "json", "skip")
-            if overview_json_path.exists() and not skip_json:
-                LOGGER.info("Reading JSON for old year %g", year)
-                json = JSON(year, is_current_year=False, fields=self._fields)
-                if self._fields.get_bool_field(year, "json", "old"):
-                    json.read_old_file(
-                        overview_json_path,
-                        positions=self._year_positions.get(int(year)),
-                        tracks=self._tracks,
-                        artists=self._year_artists.get(int(year)),
-                    )
-                else:
-                    json.read_file(
-                        overview_json_path,
-                        positions=self._year_positions.get(int(year)),
-                        tracks=self._tracks,
-                        artists=self._year_artists.get(int(year)),
+            with PROFILER.phase("read_old_year", year):
+                self._read_old_year(
+                    year,
+                    overview_csv_name,
+                    overview_json_name,
+                    _prepare_old_year(
+                        self._fields,
+                        year,
+                        overview_csv_name,
+                        overview_json_name,
+                        snapshots=True,
                     )
-                self._year_positions[int(year)] = json.positions
-                self._year_artists[int(year)] = json.artists
-            else:
-                # No JSON file, so use overview CSV (very old years)
-                # These are overview CSV files with possibly multiple years
-                # The current year position is stored in a "pos XXXX" field
-                self._fields.update_year(
-                    year, {"csv": {"pos": f"pos {int(year)}"}}
+                    if snapshots
+                    else (None, None),
                 )
 
-            overview_csv_path = Path(overview_csv_name)
-            if overview_csv_path.exists():
-                # Read CSV even if JSON exists for release year information
-                LOGGER.info("Reading CSV for old year %g", year)
-                csv = CSV(year, is_current_year=False, fields=self._fields)
-                csv.read_file(
-                    overview_csv_path,
+    def _read_old_year(
+        self,
+        year: float,
+        overview_csv_name: str,
+        overview_json_name: str,
+        prepared: PreparedYear = (None, None),
+    ) -> None:
+        overview_json_path = Path(overview_json_name)
+        if _use_old_json(self._fields, year, overview_json_path):
+            LOGGER.info("Reading JSON for old year %g", year)
+            json = JSON(year, is_current_year=False, fields=self._fields)
+            if self._fields.get_bool_field(year, "json", "old"):
+                json.read_old_file(
+                    overview_json_path,
                     positions=self._year_positions.get(int(year)),
                     tracks=self._tracks,
                     artists=self._year_artists.get(int(year)),
+                    prepared=prepared[0],
                 )
-                self._year_positions[int(year)] = csv.positions
-                self._year_artists[int(year)] = csv.artists
+            else:
+                json.read_file(
+                    overview_json_path,
+                    positions=self._year_positions.get(int(year)),
+                    tracks=self._tracks,
+                    artists=self._year_artists.get(int(year)),
+                    prepared=prepared[0],
+                )
+            self._year_positions[int(year)] = json.positions
+            self._year_artists[int(year)] = json.artists
+            self._merge_inputs(json)
+
+        overview_csv_path = Path(overview_csv_name)
+        if overview_csv_path.exists():
+            # Read CSV even if JSON exists for release year information
+            LOGGER.info("Reading CSV for old year %g", year)
+            csv = CSV(year, is_current_year=False, fields=self._fields)
+            csv.read_file(
+                overview_csv_path,
+                positions=self._year_positions.get(int(year)),
+                tracks=self._tracks,
+                artists=self._year_artists.get(int(year)),
+                prepared=prepared[1],
+            )
+            self._year_positions[int(year)] = csv.positions
+            self._year_artists[int(year)] = csv.artists
+            self._merge_inputs(csv)
 
     def _fill_old_year_overview(self) -> None:
-        for key, track in self._tracks.items():
-            for field, value in track.items():
-                if (
-                    field.isnumeric()
-                    and (year := float(field)) < self.latest_year
-                    and (pos := int(value)) > 0
-                ):
+        assert self._table is not None, "Tracks must be compacted"
+        latest_year = self.latest_year
+        for field in self._table.fields:
+            if not field.isnumeric() or (year := float(field)) >= latest_year:
+                continue
+
+            for key, value in self._table.scan(field):
+                if (pos := int(value)) > 0:
                     year_positions = self._year_positions.setdefault(year, {})
                     year_positions.setdefault(pos, []).append(key)
 
                     year_artists = self._year_artists.setdefault(year, {})
-                    chart = year_artists.setdefault(key[0], [])
-                    if pos not in chart:
-                        bisect.insort(chart, pos)
+                    year_artists.setdefault(key[0], []).append(pos)
+
+        for year_artists in self._year_artists.values():
+            self._sort_artist_charts(year_artists)
 
     @property
     @override
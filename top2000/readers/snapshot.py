@@ -0,0 +1,79 @@
+"""
+Persistent snapshots of prepared input files.
+"""
+
+import hashlib
+import json
+import pickle
+from glob import escape
+from pathlib import Path
+from typing import ClassVar, cast, final
+
+from ..normalization import Normalizer
+from .base import Fields, PreparedFile
+
+
+@final
+class Snapshot:
+    """
+    Cached rows and normalized names of an input file. The snapshot is stored
+    in the cache directory with a key that covers the contents of the input
+    file, the field settings of the year, the normalization fixes and the
+    variant of the reader. Each variant of an input file has its own snapshot,
+    so that reading the file for the current year and for an old year do not
+    replace each other. Snapshots are pickled, which loads them faster than
+    parsing the input file again.
+    """
+
+    version: ClassVar[int] = 3
+    directory: ClassVar[Path] = Path(".top2000-cache")
+
+    def __init__(self, path: Path, fields: Fields, variant: str) -> None:
+        algo = hashlib.sha256()
+        algo.update(f"{self.version}/{variant}/".encode())
+        algo.update(json.dumps(fields, sort_keys=True).encode())
+        algo.update(Normalizer.get_instance().fixes_hash.encode())
+        with path.open("rb") as input_file:
+            algo.update(hashlib.file_digest(input_file, "sha256").digest())
+
+        self._prefix: str = f"snapshot-{path.stem}-{variant}-"
+        self._path: Path = (
+            self.directory / f"{self._prefix}{algo.hexdigest()}.pickle"
+        )
+
+    @property
+    def path(self) -> Path:
+        """
+        Retrieve the path to the snapshot file.
+        """
+
+        return self._path
+
+    def load(self) -> PreparedFile | None:
+        """
+        Load the prepared rows and normalized names from the snapshot, if it
+        exists and is readable.
+        """
+
+        try:
+            # Snapshots are only written by this class in the cache directory
+            with self._path.open("rb") as snapshot_file:
+                return cast(PreparedFile, pickle.load(snapshot_file))  # noqa: S301
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, prepared: PreparedFile) -> None:
+        """
+        Store the prepared rows and normalized names in the snapshot, replacing
+        outdated snapshots of the same input file and variant.
+        """
+
+        digest_pattern = "?" * hashlib.sha256().digest_size * 2
+        self.directory.mkdir(exist_ok=True)
+        for outdated in self.directory.glob(
+            f"{escape(self._prefix)}{digest_pattern}.pickle"
+        ):
+            outdated.unlink(missing_ok=True)
+
+        with self._path.open("wb") as snapshot_file:
+            pickle.dump(prepared, snapshot_file, pickle.HIGHEST_PROTOCOL)
@@ -2,22 +2,18 @@
 Wikipedia API parsed HTML reader.
 """
 
-import bisect
+import asyncio
 import hashlib
 import json
-import sys
 from html.parser import HTMLParser
-from http.client import HTTPResponse
 from itertools import chain
 from pathlib import Path
-from typing import cast, final
-from urllib.error import HTTPError, URLError
+from typing import ClassVar, cast, final
 from urllib.parse import parse_qs, quote, urljoin, urlparse
-from urllib.request import Request, urlopen
 
 from typing_extensions import override
 
-from .. import __version__ as module_version
+from ..logging import LOGGER
 from ..normalization import Normalizer
 from .base import (
     Artists,
@@ -26,15 +22,28 @@ from .base import (
     ExtraPositions,
     FieldHolder,
     FieldMap,
+    FieldTable,
     Key,
     KeySet,
     Positions,
     RelevantKeys,
     Row,
 )
+from .fetch import Fetcher, FetchError, Validators
 
-ParseResult = dict[str, dict[str, str | dict[str, str]]]
+ParseResult = dict[str, dict[str, str | int | dict[str, str]]]
+RevisionResult = dict[str, dict[str, list[dict[str, list[dict[str, int]]]]]]
 RowLinks = dict[str, dict[str, str]]
+Table = tuple[list[Row], list[RowLinks]]
+
+# States of the table parser, with tags of rows and cells at the bottom of the
+# state stack and tags within cells above them
+_ROW = 1
+_HEADER = 2
+_CELL = 3
+_LINK = 4
+_SPAN = 5
+_HIDDEN = 6
 
 
 @final
@@ -43,16 +52,18 @@ class WikiHTMLParser(HTMLParser):
     Parser of wiki table with chart data.
     """
 
-    TAGS = frozenset({"tr", "th", "td"})
+    TAGS: ClassVar[dict[str, int]] = {"tr": _ROW, "th": _HEADER, "td": _CELL}
     CELL_TAGS = frozenset({"a", "span"})
 
+    version: ClassVar[int] = 1
+
     def __init__(self) -> None:
         super().__init__()
         self._headers: list[str] = []
         self._rows: list[Row] = []
         self._row: int = 0
         self._column: int = 0
-        self._state: str | None = None
+        self._state: list[int] = []
         self._links: list[RowLinks] = []
         self._title: str | None = None
 
@@ -63,10 +74,18 @@ class WikiHTMLParser(HTMLParser):
         self._rows = []
         self._row = 0
         self._column = 0
-        self._state = None
+        self._state = []
         self._links = []
         self._title = None
 
+    @property
+    def headers(self) -> list[str]:
+        """
+        Retrieve the column names from the header cells.
+        """
+
+        return self._headers
+
     @property
     def rows(self) -> list[Row]:
         """
@@ -87,16 +106,16 @@ class WikiHTMLParser(HTMLParser):
     def handle_starttag(
         self, tag: str, attrs: list[tuple[str, str | None]]
     ) -> None:
-        if tag in self.TAGS:
-            self._state = tag
-        elif tag in self.CELL_TAGS and self._state is not None:
+        if (state := self.TAGS.get(tag)) is not None:
+            self._state = [state]
+        elif tag in self.CELL_TAGS and self._state:
             attributes = dict(attrs)
-            if tag == "span" and "style" in attributes:
-                self._state = f"{self._state}/hidden"
+            if tag == "span":
+                self._state.append(_HIDDEN if "style" in attributes else _SPAN)
                 return
 
-            self._state = f"{self._state}/{tag}"
-            if tag == "a" and self._headers:
+            self._state.append(_LINK)
+            if self._headers:
                 if "class" in attributes and "new" in str(attributes["class"]):
                     url = str(attributes["href"])
                     title = parse_qs(urlparse(url).query)["title"][0]
@@ -115,23 +134,26 @@ class WikiHTMLParser(HTMLParser):
         elif tag == "td":
             self._column += 1
         if tag in self.TAGS:
-            self._state = None
-        elif tag in self.CELL_TAGS and self._state is not None:
-            self._state = "/".join(self._state.split("/")[:-1])
+            self._state = []
+        elif tag in self.CELL_TAGS and len(self._state) > 1:
+            _ = self._state.pop()
 
     @override
     def handle_data(self, data: str) -> None:
-        if self._state == "td/hidden":
+        if not self._state:
+            return
+        state = self._state[0]
+        depth = len(self._state)
+        if state == _CELL and depth == 2 and self._state[1] == _HIDDEN:
             return
 
         data = data.strip("\n")
-        if self._state == "th":
+        if state == _HEADER and depth == 1:
             if data.isnumeric() and len(data) == 2:
                 data = "1999" if data == "99" else f"20{data}"
             self._headers.append(data)
         elif (
-            self._state is not None
-            and self._state.startswith("td")
+            state == _CELL
             and self._headers
             and data not in {"\u2014", "\u00d7"}
         ):
@@ -144,14 +166,223 @@ class WikiHTMLParser(HTMLParser):
                 self._title = None
 
 
-class WikiURLError(URLError):
+class PageState(Validators, total=False):
+    """
+    State of a cached wiki page, with the revision ID of the page and the
+    validators of the response that contained it.
+    """
+
+    revid: int
+
+
+class WikiURLError(FetchError):
     """
     Error indicating a problem when retrieving a page from a wiki.
     """
 
-    @override
-    def __str__(self) -> str:
-        return str(self.reason)
+
+@final
+class WikiSource:
+    """
+    Article or revision of an article on a wiki with a table of charts. The
+    HTML of the article is retrieved from the API and cached, along with the
+    rows and links of the parsed table.
+    """
+
+    def __init__(
+        self, api: str, page: str, oldid: int, fetcher: Fetcher
+    ) -> None:
+        self._api = api
+        self._page = page
+        self._oldid = oldid
+        self._fetcher = fetcher
+
+    @property
+    def api_url(self) -> str:
+        """
+        Retrieve the API URL to retrieve the parsed article from.
+        """
+
+        if self._oldid == 0:
+            page_query = f"page={quote(self._page)}"
+        else:
+            page_query = f"oldid={self._oldid}"
+
+        return f"{self._api}?action=parse&{page_query}&format=json"
+
+    @property
+    def hash(self) -> str:
+        """
+        Retrieve the hash of the API URL which identifies the cache files.
+        """
+
+        algo = hashlib.sha256()
+        algo.update(self.api_url.encode("utf-8"))
+        return algo.hexdigest()
+
+    def _get_revision_url(self) -> str:
+        return (
+            f"{self._api}?action=query&prop=revisions"
+            f"&titles={quote(self._page)}"
+            "&rvprop=ids&format=json&formatversion=2"
+        )
+
+    def _read_revision(self) -> int | None:
+        result = self._fetcher.fetch(self._get_revision_url())
+        if result is None:
+            return None
+
+        data = cast(RevisionResult, json.loads(result[0]))
+        pages = data.get("query", {}).get("pages", [])
+        revisions = pages[0].get("revisions", []) if pages else []
+        return revisions[0].get("revid") if revisions else None
+
+    def _read_http(
+        self, validators: Validators
+    ) -> tuple[str, PageState] | None:
+        result = self._fetcher.fetch(self.api_url, validators)
+        if result is None:
+            return None
+
+        body, state = result
+        data = cast(ParseResult, json.loads(body))
+        if "error" in data:
+            raise WikiURLError(f"Parsing failed: {data['error']['info']}")
+        text = data["parse"]["text"]
+        if not isinstance(text, dict):
+            raise WikiURLError(f"Unexpected parse result text: {text}")
+        page_state: PageState = {**state}
+        if isinstance(revid := data["parse"].get("revid"), int):
+            page_state["revid"] = revid
+        return text["*"], page_state
+
+    @staticmethod
+    def _load_state(path: Path) -> PageState:
+        try:
+            with path.open("r", encoding="utf-8") as state_file:
+                return cast(PageState, json.load(state_file))
+        except (OSError, ValueError):
+            return {}
+
+    def _update_page(
+        self, path: Path, state_path: Path
+    ) -> tuple[PageState, bool]:
+        """
+        Retrieve the page HTML if it is not cached yet, or if the cached page
+        is not pinned to a revision and a later revision exists. The cached
+        page is revalidated with the latest revision ID of the page and the
+        validators of the earlier response. The state of the cached page is
+        returned, along with whether the cached page HTML was replaced.
+        """
+
+        state = self._load_state(state_path)
+        exists = path.exists()
+        if not exists:
+            result = self._read_http({})
+            if result is None:
+                raise WikiURLError(f"No page retrieved for {path}")
+        elif self._oldid != 0:
+            return state, False
+        else:
+            try:
+                revid = self._read_revision()
+                if revid is not None and revid == state.get("revid"):
+                    LOGGER.info("Cached wiki page %s is up to date", path)
+                    return state, False
+
+                result = self._read_http(state)
+            except FetchError as error:
+                LOGGER.warning(
+                    "Could not revalidate cached wiki page %s: %s", path, error
+                )
+                return state, False
+
+            if result is None:
+                LOGGER.info("Cached wiki page %s is not modified", path)
+                return state, False
+
+        html, new_state = result
+        changed = (
+            not exists
+            or "revid" not in new_state
+            or state.get("revid") != new_state["revid"]
+        )
+        if changed:
+            with path.open("w", encoding="utf-8") as wiki_file:
+                _ = wiki_file.write(html)
+        with state_path.open("w", encoding="utf-8") as state_file:
+            json.dump(new_state, state_file)
+        return new_state, changed
+
+    @staticmethod
+    def _load_table(path: Path, state: PageState) -> Table | None:
+        try:
+            with path.open("r", encoding="utf-8") as table_file:
+                table = cast(dict[str, object], json.load(table_file))
+        except (OSError, ValueError):
+            return None
+
+        if table.get("version") != WikiHTMLParser.version or table.get(
+            "revid"
+        ) != state.get("revid"):
+            return None
+
+        columns = cast(list[str], table["columns"])
+        rows: list[Row] = [
+            {
+                column: value
+                for column, value in zip(columns, cells, strict=True)
+                if value is not None
+            }
+            for cells in cast(list[list[str | None]], table["rows"])
+        ]
+        return rows, cast(list[RowLinks], table["links"])
+
+    @staticmethod
+    def _save_table(
+        path: Path, state: PageState, headers: list[str], table: Table
+    ) -> None:
+        rows, links = table
+        columns = dict.fromkeys(headers)
+        with path.open("w", encoding="utf-8") as table_file:
+            json.dump(
+                {
+                    "version": WikiHTMLParser.version,
+                    "revid": state.get("revid"),
+                    "columns": list(columns),
+                    "rows": [
+                        [row.get(column) for column in columns] for row in rows
+                    ],
+                    "links": links,
+                },
+                table_file,
+                separators=(",", ":"),
+            )
+
+    def read_table(self) -> Table:
+        """
+        Retrieve the rows and links of the chart table. The parsed table is
+        cached along with the HTML of the page, such that the HTML only needs
+        to be parsed again when the parser or the revision of the page changes.
+        """
+
+        wiki_hash = self.hash
+        path = Path(f"wiki{wiki_hash}.html")
+        state, changed = self._update_page(
+            path, Path(f"wiki{wiki_hash}.state.json")
+        )
+        table_path = Path(f"wiki{wiki_hash}.table.json")
+        if not changed and (table := self._load_table(table_path, state)):
+            return table
+
+        with path.open("r", encoding="utf-8") as wiki_file:
+            html = wiki_file.read()
+
+        parser = WikiHTMLParser()
+        parser.feed(html)
+        table = (parser.rows, parser.links)
+        self._save_table(table_path, state, parser.headers, table)
+        return table
 
 
 @final
@@ -182,53 +413,57 @@ class Wiki(Base):
     def input_format(self) -> str | None:
         return "wiki"
 
-    def _get_api_url(self) -> str:
-        api = self._get_str_field("api", "https://nl.wikipedia.org/w/api.php")
-        oldid = self._get_int_field("oldid")
-        if oldid == 0:
-            page = self._get_str_field("page", "Lijst_van_Radio_2-Top_2000's")
-            page_query = f"page={quote(page)}"
-        else:
-            page_query = f"oldid={oldid}"
+    def _get_fetcher(self) -> Fetcher:
+        return Fetcher(
+            timeout=self._get_float_field("timeout", 30.0),
+            retries=self._get_int_field("retries", 3),
+            backoff=self._get_float_field("backoff", 1.0),
+        )
 
-        return f"{api}?action=parse&{page_query}&format=json"
+    def _get_source(
+        self, fetcher: Fetcher | None = None, fields: FieldTable | None = None
+    ) -> WikiSource:
+        if fetcher is None:
+            fetcher = self._get_fetcher()
+        if fields is None:
+            fields = {}
+
+        api = fields.get(
+            "api",
+            self._get_str_field("api", "https://nl.wikipedia.org/w/api.php"),
+        )
+        page = fields.get(
+            "page",
+            self._get_str_field("page", "Lijst_van_Radio_2-Top_2000's"),
+        )
+        # A source with another page uses its latest revision unless pinned
+        oldid = fields.get(
+            "oldid", 0 if "page" in fields else self._get_int_field("oldid")
+        )
+        assert isinstance(api, str), "api must be a string"
+        assert isinstance(page, str), "page must be a string"
+        assert isinstance(oldid, int), "oldid must be an int"
+        return WikiSource(api, page, oldid, fetcher)
 
-    def _get_hash(self) -> str:
-        url = self._get_api_url()
-        algo = hashlib.sha256()
-        algo.update(url.encode("utf-8"))
-        return algo.hexdigest()
+    def _get_sources(self) -> list[WikiSource]:
+        """
+        Retrieve the article sources to read tables from: the article or
+        revision of the wiki fields and any additional sources.
+        """
 
-    def _read_http(self) -> str:
-        url = self._get_api_url()
+        fetcher = self._get_fetcher()
+        source = self._get_source(fetcher)
+        sources = {source.hash: source}
+        for fields in self._fields.get_table_list_field(
+            self._year, self.input_format, "sources"
+        ):
+            source = self._get_source(fetcher, fields)
+            _ = sources.setdefault(source.hash, source)
 
-        python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
-        headers = {
-            "User-Agent": f"top2000/{module_version} python/{python_version}",
-        }
-        try:
-            if not url.startswith(("http:", "https:")):
-                raise WikiURLError("Attempt to read from non-HTTP URL")
-            with urlopen(Request(url, headers=headers)) as response:  # noqa: S310 # pyright: ignore[reportAny]
-                if not isinstance(response, HTTPResponse):
-                    raise WikiURLError("Unexpected return type for urlopen")
-                data: ParseResult = cast(ParseResult, json.load(response))
-                if "error" in data:
-                    raise WikiURLError(
-                        f"Parsing failed: {data['error']['info']}"
-                    )
-                if not isinstance(data["parse"]["text"], dict):
-                    raise WikiURLError(
-                        f"Unexpected parse result text: {data['parse']['text']}"
-                    )
-                return data["parse"]["text"]["*"]
-        except HTTPError as error:
-            body = error.fp.read().decode("utf-8")
-            raise WikiURLError(
-                f"Unexpected status code {error.code} from {url}: {body}"
-            ) from error
-        except URLError as error:
-            raise WikiURLError(f"Connection error for {url}") from error
+        return list(sources.values())
+
+    def _get_api_url(self) -> str:
+        return self._get_source().api_url
 
     @override
     def reset(self) -> None:
@@ -243,32 +478,46 @@ class Wiki(Base):
         self._positions = self._year_positions.setdefault(self._year, {})
         self._artists = self._year_artists.setdefault(self._year, {})
 
+    async def _read_tables(self, sources: list[WikiSource]) -> list[Table]:
+        """
+        Retrieve the tables of the sources concurrently, with a limit on the
+        number of sources that are retrieved or parsed at the same time.
+        """
+
+        concurrency = max(1, self._get_int_field("concurrency", 4))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def read_table(source: WikiSource) -> Table:
+            async with semaphore:
+                return await asyncio.to_thread(source.read_table)
+
+        return await asyncio.gather(*(read_table(source) for source in sources))
+
     @override
     def read(self) -> None:
-        path = Path(f"wiki{self._get_hash()}.html")
-        if path.exists():
-            with path.open("r", encoding="utf-8") as wiki_file:
-                html = wiki_file.read()
-        else:
-            html = self._read_http()
-            with path.open("w", encoding="utf-8") as wiki_file:
-                _ = wiki_file.write(html)
-
-        parser = WikiHTMLParser()
-        parser.feed(html)
+        sources = self._get_sources()
+        tables = asyncio.run(self._read_tables(sources))
+        for source in sources:
+            self._record_input(Path(f"wiki{source.hash}.html"))
         fields = {
             "pos": str(int(self._year)),
             "artist": self._get_str_field("artist", "Artiest"),
             "title": self._get_str_field("title", "Titel"),
             "year": self._get_str_field("year", "Jaar"),
         }
-        for row, links in zip(parser.rows[1:], parser.links[1:], strict=True):
-            try:
-                best_key, position = self._read_row(row, fields)
-                if best_key is not None:
-                    self._fill_links(best_key, position, fields, links)
-            except KeyError as error:
-                raise KeyError(f"Could not parse row: {row}") from error
+        for rows, links in tables:
+            for row, row_links in zip(rows[1:], links[1:], strict=True):
+                try:
+                    best_key, position = self._read_row(row, fields)
+                    if best_key is not None:
+                        self._fill_links(best_key, position, fields, row_links)
+                except KeyError as error:
+                    raise KeyError(f"Could not parse row: {row}") from error
+
+        for year_artists in self._year_artists.values():
+            self._sort_artist_charts(year_artists)
+        self._sort_artist_charts(self._artists)
+        self.compact()
 
     def _fill_links(
         self,
@@ -278,7 +527,9 @@ class Wiki(Base):
         links: RowLinks,
     ) -> None:
         if title_links := links.get(fields["title"], {}):
-            self._tracks[best_key]["title_link"] = title_links.popitem()[0]
+            self._writable_track(best_key)["title_link"] = (
+                title_links.popitem()[0]
+            )
 
         artist_links: Row = {}
         normalizer = Normalizer.get_instance()
@@ -350,8 +601,9 @@ class Wiki(Base):
                 title_alternatives[-1].lower(),
             )
             self._tracks[best_key] = row
-        self._tracks[best_key]["artiest"] = artist_alternatives[-1]
-        self._tracks[best_key]["titel"] = title_alternatives[-1]
+        track = self._writable_track(best_key)
+        track["artiest"] = artist_alternatives[-1]
+        track["titel"] = title_alternatives[-1]
 
         return best_key, True
 
@@ -369,9 +621,7 @@ class Wiki(Base):
 
                 for key in chain(keys, rejected_keys):
                     year_artists = self._year_artists.setdefault(year, {})
-                    chart = year_artists.setdefault(key[0], [])
-                    if pos not in chart:
-                        bisect.insort(chart, pos)
+                    year_artists.setdefault(key[0], []).append(pos)
 
     @override
     def select_relevant_keys(
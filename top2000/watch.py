@@ -0,0 +1,51 @@
+"""
+Polling of input and settings files for changes.
+"""
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import final
+
+Stat = tuple[int, int] | None
+
+
+@final
+class Watcher:
+    """
+    Poller of files which detects changes by their modification time and size.
+    Files which do not exist yet are watched as well, so that they are seen as
+    changed once they are created, and likewise when watched files are removed.
+    """
+
+    def __init__(self, paths: Iterable[Path] = ()) -> None:
+        self._stats: dict[Path, Stat] = {}
+        self.watch(paths)
+
+    @staticmethod
+    def _stat(path: Path) -> Stat:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        """
+        Start watching files for changes, unless they are watched already.
+        """
+
+        for path in paths:
+            if path not in self._stats:
+                self._stats[path] = self._stat(path)
+
+    def poll(self) -> set[Path]:
+        """
+        Retrieve the watched files which changed since they were last polled.
+        """
+
+        changed: set[Path] = set()
+        for path, stat in self._stats.items():
+            if (new_stat := self._stat(path)) != stat:
+                self._stats[path] = new_stat
+                changed.add(path)
+        return changed
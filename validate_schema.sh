@@ -40,9 +40,24 @@ if ls top2000-*.json 1>/dev/null 2>&1; then
 	check schema/top2000.json top2000-*.json
 fi
 
-if ls output-*.json 1>/dev/null 2>&1; then
+dumps=()
+columnar=()
+for file in output-*.json; do
+	if [[ "$file" = *.columnar.json ]]; then
+		columnar+=("$file")
+	elif [[ -e "$file" ]]; then
+		dumps+=("$file")
+	fi
+done
+
+if [[ ${#dumps[@]} -gt 0 ]]; then
 	echo "Validating JSON output format dumps: output-*.json"
-	check schema/dump.json output-*.json
+	check schema/dump.json "${dumps[@]}"
+fi
+
+if [[ ${#columnar[@]} -gt 0 ]]; then
+	echo "Validating columnar JSON output format dumps: output-*.columnar.json"
+	check schema/columnar.json "${columnar[@]}"
 fi
 
 echo "Validating pyproject.toml"
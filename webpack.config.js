@@ -9,6 +9,8 @@ import { WebpackManifestPlugin } from 'webpack-manifest-plugin';
 const outputPublicPath = process.env.OUTPUT_PUBLIC_PATH || '';
 const singleFile = process.env.SINGLE_FILE === 'true';
 const external = process.env.EXTERNAL_MANIFEST === 'true';
+const sharded = process.env.SHARDED_DUMP === 'true';
+const columnar = process.env.COLUMNAR_DUMP === 'true';
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 const anchors = new Map();
@@ -129,7 +131,7 @@ const config = {
                     chunks: 'all',
                     filename: '[name].[contenthash].js',
                     name: 'data',
-                    test: /output-sorted\.json/,
+                    test: /output-sorted(\.columnar)?\.json/,
                     type: 'json'
                 },
                 vendor: {
@@ -155,7 +157,8 @@ const config = {
             patterns: [
                 {
                     from: "schema/*.json"
-                }
+                },
+                ...(sharded ? [{ from: "output-sorted/*.json" }] : [])
             ]
         }),
         new HtmlWebpackPlugin({
@@ -188,12 +191,16 @@ const config = {
         }),
         new WebpackManifestPlugin({
             filter: (file) => file.name !== "index.html" &&
-                !file.name.startsWith("schema/")
+                !file.name.startsWith("schema/") &&
+                !file.name.startsWith("output-sorted/")
         })
     ],
     resolve: {
         alias: {
-            "@output": resolve(__dirname)
+            "@output": resolve(__dirname),
+            "@current": resolve(__dirname, sharded ? 'srv/current-shards.js' :
+                columnar ? 'srv/current-columnar.js' : 'srv/current.js'
+            )
         }
     },
     watchOptions: {